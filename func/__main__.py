@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import sys
+
+from func.aio import MAX_QUEUED, AsyncDownloader
+from func.bandwidth import parse_rate
+from func.engine import DownloadEngine
+from func.formats import DEFAULT_PROFILE, PROFILES
+from func.postprocess import AUDIO_CODECS, DEFAULT_AUDIO_CODEC
+from func.pool import EXECUTORS
+from func.server import API_PORT, ControlServer
+
+
+def read_urls(args):
+    # генератор: длинный список ссылок читается по мере освобождения очереди
+    yield from args.urls
+    sources = []
+    if args.input:
+        sources.append(sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8'))
+    elif not args.urls and args.serve is None:
+        sources.append(sys.stdin)
+    for source in sources:
+        with source:
+            for line in source:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m func', description='PyTubeLoader без графического интерфейса')
+    parser.add_argument('urls', nargs='*', help='ссылки на видео (иначе читаются из --input или stdin)')
+    parser.add_argument('-i', '--input', help="файл со ссылками, по одной в строке ('-' для stdin)")
+    parser.add_argument('-o', '--out-dir', default='.', help='папка для загрузок')
+    parser.add_argument('-j', '--jobs', type=int, default=4, help='одновременных загрузок')
+    parser.add_argument('--pool-size', type=int, default=None, help='размер пула воркеров (по умолчанию = --jobs)')
+    parser.add_argument('--proxy', default=None)
+    parser.add_argument('-x', '--audio', action='store_true', help='скачать только звук')
+    parser.add_argument('--audio-codec', choices=AUDIO_CODECS, default=DEFAULT_AUDIO_CODEC,
+                        help="кодек звука ('best' - без перекодирования, если возможно)")
+    parser.add_argument('-O', '--output', default=None, metavar='TEMPLATE',
+                        help="шаблон имени файла yt-dlp, например '%%(artist)s - %%(title)s.%%(ext)s'")
+    parser.add_argument('-f', '--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help='профиль выбора формата')
+    parser.add_argument('-N', '--fragments', type=int, default=1, help='фрагментов DASH/HLS параллельно')
+    parser.add_argument('-c', '--connections', type=int, default=1,
+                        help='соединений на один обычный HTTP-файл (загрузка кусками)')
+    parser.add_argument('-r', '--limit-rate', type=parse_rate, default=0, metavar='RATE',
+                        help='общий лимит скорости всех загрузок, например 500K или 2M')
+    parser.add_argument('--job-rate', type=parse_rate, default=0, metavar='RATE',
+                        help='лимит скорости одной загрузки')
+    parser.add_argument('--playlist', action='store_true', help='раскрывать плейлисты и каналы')
+    parser.add_argument('--state', default=None, help='файл состояния очереди для продолжения загрузок')
+    parser.add_argument('--executor', choices=sorted(EXECUTORS), default='process',
+                        help='где выполнять задачи: процессы, потоки или текущий поток')
+    parser.add_argument('--max-queued', type=int, default=MAX_QUEUED,
+                        help='сколько ссылок держать в очереди одновременно')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='считать загрузку зависшей, если от неё нет вестей столько секунд')
+    parser.add_argument('-q', '--quiet', action='store_true', help='не печатать прогресс')
+    parser.add_argument('--serve', type=int, nargs='?', const=API_PORT, default=None, metavar='PORT',
+                        help=f'запустить локальный HTTP API и работать до Ctrl+C (порт по умолчанию {API_PORT})')
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    engine = DownloadEngine(out_dir=args.out_dir, proxy=args.proxy, pool_size=args.pool_size or args.jobs,
+                            max_downloads=args.jobs, state_path=args.state, executor=args.executor,
+                            stall_timeout=args.timeout, fragments=args.fragments, connections=args.connections,
+                            bandwidth_limit=args.limit_rate, job_limit=args.job_rate, format_profile=args.profile,
+                            audio_codec=args.audio_codec)
+    downloader = AsyncDownloader(engine, max_queued=args.max_queued)
+    results = {}
+
+    def on_finished(index, ok, msg):
+        results[index] = ok
+        url = engine.jobs[index]['url']
+        print(f"{'OK' if ok else 'FAIL'}\t{url}\t{msg}", flush=True)
+
+    def on_status(index, text):
+        if not args.quiet:
+            print(f"[{index}] {text}", file=sys.stderr, flush=True)
+
+    def on_entries(playlist_id, entries):
+        for index, _url, _title in entries:
+            downloader.start_download(index)
+
+    def on_playlist_finished(playlist_id, ok, msg):
+        if not ok:
+            print(f"FAIL\tplaylist {playlist_id}\t{msg}", flush=True)
+            results[('playlist', playlist_id)] = False
+
+    engine.connect('finished', on_finished)
+    engine.connect('status', on_status)
+    engine.connect('playlist_entries', on_entries)
+    engine.connect('playlist_finished', on_playlist_finished)
+
+    mode = 'audio' if args.audio else 'video'
+    server = None
+    async with downloader:
+        if args.serve is not None:
+            server = ControlServer(engine, port=args.serve)
+            server.start()
+            print("HTTP API: http://%s:%s" % server.address, file=sys.stderr, flush=True)
+        try:
+            for index in engine.restore():
+                downloader.start_download(index)
+            for url in read_urls(args):
+                if args.playlist:
+                    engine.expand_playlist(url, mode, args.output)
+                else:
+                    await downloader.submit(url, mode, args.output)
+            await downloader.join()
+            if server is not None:
+                await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            for index in engine.jobs.ids():
+                engine.stop_download(index)
+            raise
+        finally:
+            if server is not None:
+                server.stop()
+    return 0 if all(results.values()) else 1
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == '__main__':
+    sys.exit(main())
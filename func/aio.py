@@ -0,0 +1,116 @@
+import asyncio
+
+from func.engine import DownloadEngine
+
+POLL_INTERVAL = 0.5
+MAX_QUEUED = 1000
+
+
+class AsyncDownloader:
+    # asyncio-обвязка движка: все задачи ведёт один цикл событий, работа идёт в пуле исполнителя
+    def __init__(self, engine=None, max_queued=MAX_QUEUED, poll=POLL_INTERVAL, **kwargs):
+        self.engine = engine if engine is not None else DownloadEngine(**kwargs)
+        self.max_queued = max(1, int(max_queued))
+        self.poll = poll
+        self._loop = None
+        self._reader = None
+        self._active = set()
+        self._waiters = {}
+        self._room = None
+        self._tick = None
+        self.engine.connect('finished', self._on_finished)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        if self._reader is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._room = asyncio.Event()
+        self._room.set()
+        self._tick = asyncio.Event()
+        # отложенные вызовы движка (пауза, таймауты, сохранение) идут через этот же цикл
+        self.engine.call_later = self._loop.call_later
+        self._reader = asyncio.create_task(self._read())
+
+    async def close(self):
+        if self._reader is None:
+            return
+        self._reader.cancel()
+        try:
+            await self._reader
+        except asyncio.CancelledError:
+            pass
+        self._reader = None
+        for futures in self._waiters.values():
+            for future in futures:
+                future.cancel()
+        self._waiters.clear()
+        self.engine.shutdown()
+
+    async def _read(self):
+        while True:
+            # блокирующее чтение очереди уходит в поток, обработка - в цикле событий
+            batch = await asyncio.to_thread(self.engine.read_batch, self.poll)
+            if batch:
+                self.engine.handle_batch(batch)
+            self._tick.set()
+
+    def _on_finished(self, index, ok, message):
+        self._active.discard(index)
+        if len(self._active) < self.max_queued:
+            self._room.set()
+        for future in self._waiters.pop(index, ()):
+            if not future.done():
+                future.set_result((ok, message))
+
+    def start_download(self, index):
+        self.engine.start_download(index)
+        self._active.add(index)
+        if len(self._active) >= self.max_queued:
+            self._room.clear()
+
+    async def submit(self, url, mode='video', outtmpl=None):
+        # backpressure: новые ссылки ждут, пока в работе не станет меньше max_queued
+        while len(self._active) >= self.max_queued:
+            await self._room.wait()
+        created, index = self.engine.add_video(url, mode, outtmpl)
+        if created:
+            self.start_download(index)
+        return index
+
+    async def wait(self, index, timeout=None):
+        if index not in self._active:
+            status = self.engine.jobs[index].get('status')
+            return status == 'done', status
+        future = self._loop.create_future()
+        self._waiters.setdefault(index, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters = self._waiters.get(index)
+            if waiters and future in waiters:
+                waiters.remove(future)
+
+    async def download(self, url, timeout=None, mode='video', outtmpl=None):
+        index = await self.submit(url, mode, outtmpl)
+        try:
+            return await self.wait(index, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # отмена корутины или таймаут ставят загрузку на паузу, .part-файл остаётся
+            if index in self.engine.jobs:
+                self.engine.stop_download(index)
+            raise
+
+    async def join(self):
+        while self.engine.has_work():
+            self._tick.clear()
+            try:
+                await asyncio.wait_for(self._tick.wait(), self.poll * 2)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,80 @@
+import multiprocessing as mp
+import time
+from datetime import datetime
+
+BURST_TIME = 0.5
+MIN_BURST = 64 * 1024
+SCHEDULE_CHECK = 30.0
+
+_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+
+
+def parse_rate(text):
+    # '500K', '2M', '1048576' -> байт в секунду; 0 или пусто - без ограничения
+    text = str(text or '0').strip().lower().removesuffix('/s').removesuffix('b')
+    unit = text[-1:] if text[-1:] in _UNITS else ''
+    return int(float(text[:len(text) - len(unit)] or 0) * _UNITS[unit])
+
+
+class TokenBucket:
+    # состояние в разделяемой памяти: один и тот же бакет видят родитель и все процессы пула
+    def __init__(self, rate=0, ctx=None):
+        self._state = (ctx or mp).Array('d', [0.0, time.monotonic(), float(rate)])
+
+    @property
+    def rate(self):
+        return self._state[2]
+
+    @rate.setter
+    def rate(self, value):
+        with self._state.get_lock():
+            self._state[2] = float(max(0, value or 0))
+
+    def consume(self, nbytes):
+        with self._state.get_lock():
+            tokens, stamp, rate = self._state[:]
+            if rate <= 0:
+                return
+            now = time.monotonic()
+            burst = max(MIN_BURST, rate * BURST_TIME)
+            # берём в долг и спим, пока долг не покроется: один захват блокировки на блок данных
+            tokens = min(burst, tokens + (now - stamp) * rate) - nbytes
+            self._state[0] = tokens
+            self._state[1] = now
+        if tokens < 0:
+            time.sleep(-tokens / rate)
+
+
+class Throttle:
+    def __init__(self, *buckets):
+        self.buckets = buckets
+
+    def __call__(self, nbytes):
+        for bucket in self.buckets:
+            bucket.consume(nbytes)
+
+
+def _minutes(text):
+    hours, _, minutes = text.partition(':')
+    return int(hours) * 60 + int(minutes or 0)
+
+
+class BandwidthSchedule:
+    # правила вида {"from": "09:00", "to": "18:00", "limit": 2097152}; интервал может переходить через полночь
+    def __init__(self, rules=None, default=0):
+        self.default = default
+        self.rules = []
+        for rule in rules or ():
+            limit = rule['limit'] if 'limit' in rule else rule.get('limit_kbps', 0) * 1024
+            self.rules.append((_minutes(rule['from']), _minutes(rule['to']), parse_rate(limit)))
+
+    def limit_at(self, moment=None):
+        moment = moment or datetime.now()
+        now = moment.hour * 60 + moment.minute
+        for start, end, limit in self.rules:
+            if start <= end and start <= now < end or start > end and (now >= start or now < end):
+                return limit
+        return self.default
+
+    def __bool__(self):
+        return bool(self.rules)
@@ -0,0 +1,67 @@
+import json
+import sqlite3
+import time
+
+CACHE_FILE = "metadata_cache.sqlite3"
+
+
+class MetadataCache:
+    def __init__(self, path=CACHE_FILE, ttl=7 * 24 * 3600, max_entries=5000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta ("
+                           "key TEXT PRIMARY KEY, info TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS meta_accessed ON meta (accessed)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM meta").fetchone()[0]
+
+    def get(self, key):
+        row = self._conn.execute("SELECT info, created FROM meta WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None or (self.ttl and now - row[1] > self.ttl):
+            if row is not None:
+                self.invalidate(key)
+            self.misses += 1
+            return None
+        self._conn.execute("UPDATE meta SET accessed = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, info):
+        now = time.time()
+        exists = self._conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone() is not None
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, info, created, accessed) VALUES (?, ?, ?, ?)",
+                           (key, json.dumps(info, ensure_ascii=False), now, now))
+        if not exists:
+            self._count += 1
+        if self.max_entries and self._count > self.max_entries:
+            # вытесняем давно не использованные записи
+            extra = self._count - self.max_entries
+            self._conn.execute("DELETE FROM meta WHERE key IN "
+                               "(SELECT key FROM meta ORDER BY accessed ASC LIMIT ?)", (extra,))
+            self._count -= extra
+        self._conn.commit()
+
+    def invalidate(self, key):
+        cur = self._conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+        self._conn.commit()
+        self._count -= cur.rowcount
+
+    def clear(self):
+        self._conn.execute("DELETE FROM meta")
+        self._conn.commit()
+        self._count = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': self._count}
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self):
+        return self._count
@@ -0,0 +1,596 @@
+import collections
+import heapq
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import queue
+import time
+
+from func.bandwidth import SCHEDULE_CHECK, BandwidthSchedule
+from func.formats import DEFAULT_PROFILE, profile_spec, select_format
+from func.jobs import JobRegistry
+from func.pool import EXECUTORS
+from func.postprocess import DEFAULT_AUDIO_CODEC, POST_TASKS
+from func.scheduler import DownloadScheduler
+from func.state import JobStore, RESUMABLE
+from func.workers import PROGRESS_DOWNLOADING, PROGRESS_FINISHED, PROGRESS_RATE
+
+logger = logging.getLogger(__name__)
+
+PERSIST_DELAY = 0.5
+READ_BATCH = 256
+
+INFO_KINDS = ('info', 'playlist')
+
+EVENTS = ('info', 'info_error', 'progress', 'status', 'finished', 'playlist_entries', 'playlist_finished')
+
+
+class DownloadEngine:
+    def __init__(self, out_dir='.', proxy=None, pool_size=4,
+                 max_downloads=4, host_limits=None, progress_rate=PROGRESS_RATE, info_json_dir='info_json',
+                 cache=None, state_path=None, call_later=None, handlers=None, executor='process',
+                 info_timeout=None, stall_timeout=None, fragments=1, connections=1,
+                 bandwidth_limit=0, job_limit=0, bandwidth_schedule=None,
+                 format_profile=DEFAULT_PROFILE, format_profiles=None,
+                 post_workers=None, post_handlers=None, audio_codec=DEFAULT_AUDIO_CODEC, info_workers=2):
+        if mp.current_process().name == 'MainProcess':
+            mp.freeze_support()
+
+        self.jobs = JobRegistry()
+        self.out_dir = out_dir
+        self.proxy = proxy
+        self.progress_rate = progress_rate
+        self.fragments = fragments
+        self.format_profile = format_profile
+        self.format_profiles = format_profiles or {}
+        self.connections = connections
+        self.info_json_dir = info_json_dir
+        self.cache = cache
+        if executor not in EXECUTORS:
+            raise ValueError(f"Неизвестный исполнитель: {executor}")
+        self._pool = EXECUTORS[executor](pool_size, handlers=handlers)
+        # сведения и плейлисты - в своём небольшом пуле, иначе новая ссылка ждёт, пока закончится чья-то загрузка
+        self._info_pool = EXECUTORS[executor](info_workers, results=self._pool.results, handlers=handlers)
+        # постобработка (ffmpeg) - в своём пуле, чтобы не держать сетевые слоты
+        self._post_kinds = post_handlers or POST_TASKS
+        self._post = EXECUTORS[executor](post_workers or os.cpu_count() or 2, results=self._pool.results,
+                                         handlers=self._post_kinds)
+        self._post_jobs = set()
+        self.audio_codec = audio_codec
+        self.scheduler = DownloadScheduler(max_downloads, host_limits)
+        self.info_timeout = info_timeout
+        self.stall_timeout = stall_timeout
+        # в пул уходит не больше info_window запросов, остальные ждут в очереди движка
+        self.info_window = self._info_pool.size * 2
+        self.job_limit = job_limit
+        self.bandwidth_schedule = BandwidthSchedule(bandwidth_schedule, default=bandwidth_limit)
+        self._schedule_timer = False
+        self._apply_bandwidth()
+        self._info_jobs = set()
+        self._info_backlog = collections.deque()
+        self._info_started = {}
+        self._last_seen = {}
+        self._watching = False
+        self._download_jobs = set()
+        # задачи, которые запустятся заново, когда прошлый запуск отпустит воркер
+        self._restarts = set()
+        self._playlists = {}
+        self._next_playlist = 0
+        self._store = JobStore(state_path) if state_path else None
+        self._persist_pending = False
+        self._listeners = {event: [] for event in EVENTS}
+        self._timers = []
+        self._timer_seq = itertools.count()
+        self.call_later = call_later or self._call_later
+        self._calls = queue.Queue()
+
+    @property
+    def results(self):
+        return self._pool.results
+
+    def connect(self, event, callback):
+        self._listeners[event].append(callback)
+
+    def disconnect(self, event, callback):
+        if callback in self._listeners[event]:
+            self._listeners[event].remove(callback)
+
+    def _emit(self, event, *args):
+        for callback in list(self._listeners[event]):
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception("Ошибка в обработчике события %s", event)
+
+    def call_soon_threadsafe(self, callback):
+        # вызов из чужого потока (например, HTTP API) выполнится в потоке движка
+        self._calls.put(callback)
+        self.results.put(('wake', -1, None))
+
+    def _run_calls(self):
+        while True:
+            try:
+                callback = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback()
+            except Exception:
+                logger.exception("Ошибка в отложенном вызове")
+
+    def has_work(self):
+        return bool(len(self.scheduler) or self._info_jobs or self._download_jobs or self._restarts
+                    or self._playlists or self._post_jobs)
+
+    def read_batch(self, timeout=None):
+        # можно вызывать из любого потока: только читает очередь результатов
+        batch = []
+        try:
+            batch.append(self.results.get(timeout=timeout))
+            while len(batch) < READ_BATCH:
+                batch.append(self.results.get_nowait())
+        except queue.Empty:
+            pass
+        return [message for message in batch if message is not None]
+
+    def pump(self, timeout=None):
+        # headless-цикл: ждём сообщения воркеров или ближайший отложенный вызов
+        if self._timers:
+            until_timer = max(0.0, self._timers[0][0] - time.monotonic())
+            timeout = until_timer if timeout is None else min(timeout, until_timer)
+        self.handle_batch(self.read_batch(timeout))
+        self.run_due_timers()
+
+    def run_due_timers(self):
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, callback = heapq.heappop(self._timers)
+            callback()
+
+    def _call_later(self, delay, callback):
+        heapq.heappush(self._timers, (time.monotonic() + delay, next(self._timer_seq), callback))
+
+    def add_video(self, url, mode='video', outtmpl=None):
+        created, index = self._add_job(url, mode, outtmpl)
+        if created:
+            self._persist_later()
+        return created, index
+
+    def _add_job(self, url, mode='video', outtmpl=None):
+        # mode='audio' - скачать только звук и извлечь его в пуле постобработки
+        created, index = self.jobs.add(url, None if mode == 'video' else mode)
+        if created:
+            item = self.jobs[index]
+            item['mode'] = mode
+            if outtmpl:
+                item['outtmpl'] = outtmpl
+        return created, index
+
+    def remove_video(self, index):
+        if index in self._download_jobs or self.scheduler.is_waiting(index):
+            self.stop_download(index)
+        self._info_jobs.discard(index)
+        self._restarts.discard(index)
+        removed = self.jobs.remove(index) is not None
+        self._persist_later()
+        return removed
+
+    def restore(self):
+        if self._store is None:
+            return []
+        restored = []
+        for record in self._store.load():
+            mode = record.get('mode', 'video')
+            created, index = self.jobs.add(record['url'], None if mode == 'video' else mode)
+            if not created:
+                continue
+            item = self.jobs[index]
+            item.update(record)
+            # сведения в jobs.json не пишутся, их хранит кэш (старые записи ещё могут их содержать)
+            info = self.cache.get(item['key']) if self.cache is not None else None
+            if info is not None:
+                item['info'] = info
+            if item.get('info'):
+                self._select_format(item)
+            restored.append(index)
+        return restored
+
+    def persist(self):
+        self._persist_pending = False
+        if self._store is None:
+            return
+        try:
+            self._store.save(self.jobs)
+        except Exception:
+            logger.exception("Не удалось сохранить состояние очереди")
+
+    def _persist_later(self):
+        if self._store is not None and not self._persist_pending:
+            self._persist_pending = True
+            self.call_later(PERSIST_DELAY, self._persist_due)
+
+    def _persist_due(self):
+        if self._persist_pending:
+            self.persist()
+
+    def get_info(self, index, save_json=False, refresh=False):
+        if index not in self.jobs:
+            raise KeyError(f"Задача {index} не найдена в очереди")
+        if index in self._info_jobs:
+            return
+        item = self.jobs[index]
+        if self.cache is not None:
+            info = None if refresh or save_json else self.cache.get(item['key'])
+            if info is not None:
+                item['title'] = info.get('title', 'Без названия')
+                item['info'] = info
+                self._select_format(item)
+                self._emit('info', index, info)
+                return
+        json_dir = self.info_json_dir if save_json else None
+        self._info_jobs.add(index)
+        self._info_backlog.append((index, self.proxy, json_dir))
+        self._submit_info()
+
+    def _submit_info(self):
+        while self._info_backlog and len(self._info_started) < self.info_window:
+            index, proxy, json_dir = self._info_backlog.popleft()
+            if index not in self._info_jobs or index not in self.jobs:
+                continue
+            self._info_pool.submit('info', index, url=self.jobs[index]['url'], proxy=proxy, json_dir=json_dir)
+            # время ставится, когда запрос возьмёт воркер: ожидание в очереди пула таймаутом не считается
+            self._info_started[index] = None
+        self._watch()
+
+    def _info_done(self, index):
+        self._info_jobs.discard(index)
+        if index in self._info_started:
+            del self._info_started[index]
+            self._submit_info()
+
+    def expand_playlist(self, url, mode='video', outtmpl=None):
+        playlist_id = self._next_playlist
+        self._next_playlist += 1
+        self._playlists[playlist_id] = (mode, outtmpl)
+        self._info_pool.submit('playlist', playlist_id, url=url, proxy=self.proxy)
+        return playlist_id
+
+    def stop_playlist(self, playlist_id):
+        if self._playlists.pop(playlist_id, None) is not None:
+            self._info_pool.cancel(playlist_id, kind='playlist')
+
+    def start_download(self, index):
+        if index not in self.jobs:
+            raise KeyError(f"Задача {index} не найдена в очереди")
+        item = self.jobs[index]
+        if self.scheduler.is_waiting(index) or index in self._download_jobs:
+            return
+        # .part-файлы продолжаются только в той же папке, куда начиналась загрузка
+        if item.get('status') not in RESUMABLE or not item.get('_out_dir'):
+            item['_out_dir'] = self.out_dir
+        item['_proxy'] = self.proxy
+        item['status'] = 'waiting'
+        self._persist_later()
+        if self._pool.is_busy(index):
+            # прошлый запуск ещё не отпустил .part-файл, продолжим после него
+            self._restarts.add(index)
+            self._emit('status', index, "Ожидает остановки прошлой загрузки")
+            return
+        self.scheduler.push(index, item['url'])
+        self._emit('status', index, "Ожидает очереди")
+        self._dispatch()
+
+    def stop_download(self, index, grace=3.0):
+        item = self.jobs[index]
+        restart = index in self._restarts
+        self._restarts.discard(index)
+        if not self.scheduler.discard(index) and not restart:
+            return
+        if index in self._download_jobs:
+            self._pool.cancel(index)
+            self._download_jobs.discard(index)
+            # если воркер не отреагировал (например, идёт слияние ffmpeg) - перезапускаем только его
+            self.call_later(grace, lambda: self._terminate_stuck(index))
+        item['status'] = 'paused'
+        self._persist_later()
+        self._emit('status', index, "Пауза")
+        self._emit('finished', index, False, "Приостановлено пользователем")
+        self._dispatch()
+
+    def configure_limits(self, max_downloads=None, host_limits=None):
+        if max_downloads is not None:
+            self.scheduler.max_active = max(1, int(max_downloads))
+        if host_limits is not None:
+            self.scheduler.set_host_limits(host_limits)
+        self._dispatch()
+
+    def configure_bandwidth(self, limit=None, job_limit=None, schedule=None):
+        if schedule is not None:
+            self.bandwidth_schedule = BandwidthSchedule(schedule, default=self.bandwidth_schedule.default)
+        if limit is not None:
+            self.bandwidth_schedule.default = max(0, int(limit))
+        if job_limit is not None:
+            self.job_limit = max(0, int(job_limit))
+            for index in self._download_jobs:
+                self._pool.set_rate(index, self._job_rate(index))
+        self._apply_bandwidth()
+
+    def set_job_limit(self, index, rate):
+        # 0 - без своего лимита, действует общий job_limit
+        self.jobs[index]['rate_limit'] = max(0, int(rate or 0)) or None
+        self._persist_later()
+        self._pool.set_rate(index, self._job_rate(index))
+
+    def _job_rate(self, index):
+        return self.jobs[index].get('rate_limit') or self.job_limit
+
+    def _apply_bandwidth(self):
+        # суммарный лимит общий для всех воркеров, поэтому освободившаяся полоса сразу достаётся остальным
+        self._pool.bandwidth.rate = self.bandwidth_schedule.limit_at()
+
+    def _schedule_due(self):
+        self._schedule_timer = False
+        self._apply_bandwidth()
+        self._watch_schedule()
+
+    def _watch_schedule(self):
+        if self.bandwidth_schedule and not self._schedule_timer and (self._download_jobs or len(self.scheduler)):
+            self._schedule_timer = True
+            self.call_later(SCHEDULE_CHECK, self._schedule_due)
+
+    def set_format_profile(self, name, index=None):
+        # без index меняет профиль по умолчанию, иначе - профиль одной задачи
+        items = [self.jobs[index]] if index is not None else list(self.jobs)
+        if index is None:
+            self.format_profile = name
+        else:
+            self.jobs[index]['profile'] = name
+            self._persist_later()
+        for item in items:
+            if item.get('info'):
+                self._select_format(item)
+
+    def _profile_of(self, item):
+        if item.get('profile'):
+            return item['profile']
+        return 'audio' if item.get('mode') == 'audio' else self.format_profile
+
+    def _select_format(self, item):
+        # формат выбирается до загрузки по сохранённым сведениям, чтобы показать его в карточке
+        profile = self._profile_of(item)
+        item['selection'] = select_format(item.get('info') or {}, profile, self.format_profiles)
+        return item['selection']
+
+    def _format_options(self, item):
+        profile = self._profile_of(item)
+        selection = item.get('selection')
+        if selection is None or selection.get('profile') != profile:
+            selection = self._select_format(item)
+        fallback = profile_spec(profile, self.format_profiles)
+        if selection is None:
+            return fallback, None, None
+        # если формат из кэша устарел, yt-dlp перейдёт к правилу профиля
+        streams = selection['format'].split('+') if selection['merge'] else None
+        return f"{selection['format']}/{fallback}", selection['merge'], streams
+
+    def configure_transfer(self, fragments=None, connections=None):
+        # действует на загрузки, запущенные после вызова
+        if fragments is not None:
+            self.fragments = max(1, int(fragments))
+        if connections is not None:
+            self.connections = max(1, int(connections))
+
+    def shutdown(self):
+        self.persist()
+        self._pool.shutdown()
+        self._info_pool.shutdown()
+        self._post.shutdown()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _dispatch(self):
+        if self.bandwidth_schedule:
+            # пока движок простаивал, таймер расписания не шёл - новые загрузки стартуют с текущим правилом
+            self._apply_bandwidth()
+        for index in self.scheduler.pop_ready():
+            item = self.jobs[index]
+            format_spec, merge_format, streams = self._format_options(item)
+            self._pool.submit('download', index, url=item['url'], out_dir=item['_out_dir'],
+                              proxy=item['_proxy'], filename=item.get('outtmpl') or item.get('_filename'),
+                              progress_rate=self.progress_rate, fragments=self.fragments,
+                              connections=self.connections, rate_limit=self._job_rate(index),
+                              format_spec=format_spec, merge_format=merge_format, streams=streams)
+            self._download_jobs.add(index)
+            self._last_seen[index] = time.monotonic()
+            item['status'] = 'downloading'
+            self._emit('status', index, "Запущено")
+        self._watch()
+        self._watch_schedule()
+
+    def _watch(self):
+        if self._watching:
+            return
+        timeouts = []
+        if self.info_timeout and self._info_started:
+            timeouts.append(self.info_timeout)
+        if self.stall_timeout and self._download_jobs:
+            timeouts.append(self.stall_timeout)
+        if timeouts:
+            self._watching = True
+            self.call_later(max(1.0, min(timeouts) / 4), self._check_timeouts)
+
+    def _check_timeouts(self):
+        self._watching = False
+        now = time.monotonic()
+        if self.info_timeout:
+            for index, started in list(self._info_started.items()):
+                if started is not None and now - started > self.info_timeout:
+                    self._info_pool.terminate(index, kind='info')
+                    self._info_done(index)
+                    self._emit('info_error', index, f"Нет ответа дольше {self.info_timeout:g} с")
+        if self.stall_timeout:
+            self._last_seen = {i: t for i, t in self._last_seen.items() if i in self._download_jobs}
+            for index in list(self._download_jobs):
+                if now - self._last_seen.get(index, now) > self.stall_timeout:
+                    self._fail_stalled(index)
+        self._watch()
+
+    def _fail_stalled(self, index):
+        self._pool.cancel(index)
+        self._download_jobs.discard(index)
+        self.scheduler.discard(index)
+        self.call_later(3.0, lambda: self._terminate_stuck(index))
+        self.jobs[index]['status'] = 'error'
+        self._persist_later()
+        message = f"Загрузка не отвечает дольше {self.stall_timeout:g} с"
+        self._emit('status', index, message)
+        self._emit('finished', index, False, message)
+        self._dispatch()
+
+    def _terminate_stuck(self, index):
+        if index not in self._download_jobs and self._pool.is_running(index):
+            self._pool.terminate(index)
+            self._resume_pending(index)
+
+    def _resume_pending(self, index):
+        if index in self._restarts and not self._pool.is_busy(index):
+            self._restarts.discard(index)
+            if index in self.jobs:
+                self.start_download(index)
+
+    def handle_batch(self, batch):
+        self._run_calls()
+        for message in batch:
+            try:
+                self._handle_message(*message)
+            except Exception:
+                logger.exception("Не удалось обработать сообщение воркера: %r", message)
+
+    def _handle_message(self, kind, index, data):
+        if kind == 'wake':
+            return
+        if kind in ('started', 'idle') and data['kind'] in self._post_kinds:
+            self._post.handle(kind, index, data)
+        elif kind in ('started', 'idle') and data['kind'] in INFO_KINDS:
+            self._info_pool.handle(kind, index, data)
+            if kind == 'started' and data['kind'] == 'info' and index in self._info_started:
+                # таймаут считаем с момента, когда запрос реально взял воркер
+                self._info_started[index] = time.monotonic()
+                self._watch()
+        elif kind in ('started', 'idle'):
+            self._pool.handle(kind, index, data)
+            if kind == 'idle' and data['kind'] == 'download':
+                self._resume_pending(index)
+        elif kind == 'entries':
+            if index not in self._playlists:
+                return
+            added = []
+            mode, outtmpl = self._playlists[index]
+            for url, title in data:
+                created, job_id = self._add_job(url, mode, outtmpl)
+                if created:
+                    self.jobs[job_id]['title'] = title
+                    added.append((job_id, url, title))
+            if added:
+                self._persist_later()
+                self._emit('playlist_entries', index, added)
+        elif kind == 'playlist_done':
+            if self._playlists.pop(index, None) is None:
+                return
+            if data.get('ok'):
+                self._emit('playlist_finished', index, True, f"Найдено записей: {data.get('count', 0)}")
+            else:
+                self._emit('playlist_finished', index, False, data.get('message', 'Ошибка'))
+        elif index not in self.jobs:
+            # задачу уже удалили из очереди, сообщение от воркера устарело
+            if kind in ('info_ok', 'info_err'):
+                self._info_done(index)
+            self._download_jobs.discard(index)
+            if kind == 'pp_done':
+                self._post_jobs.discard(index)
+        elif kind in ('pp_status', 'pp_done'):
+            self._handle_post(kind, index, data)
+        elif kind in ('info_ok', 'info_err') and index not in self._info_jobs:
+            # ответ пришёл после таймаута
+            self._info_done(index)
+        elif kind == 'info_ok':
+            info = data['info']
+            self.jobs[index]['title'] = info.get('title', 'Без названия')
+            self.jobs[index]['info'] = info
+            self._select_format(self.jobs[index])
+            if self.cache is not None:
+                self.cache.put(self.jobs[index]['key'], info)
+            self._persist_later()
+            self._info_done(index)
+            self._emit('info', index, info)
+        elif kind == 'info_err':
+            self._info_done(index)
+            self._emit('info_error', index, data.get('message', 'Ошибка'))
+        elif index not in self._download_jobs:
+            # сообщение от остановленного запуска
+            return
+        elif kind in ('status', 'progress'):
+            self._last_seen[index] = time.monotonic()
+            self._handle_progress(kind, index, data)
+        elif kind == 'done':
+            ok = bool(data.get('ok'))
+            msg = data.get('message', '')
+            self._download_jobs.discard(index)
+            self.scheduler.discard(index)
+            self._dispatch()
+            item = self.jobs[index]
+            if ok and data.get('merge'):
+                self._post_process(index, 'merge', **data['merge'])
+                return
+            if ok and item.get('mode') == 'audio' and item.get('_filepath'):
+                self._post_process(index, 'extract_audio', path=item['_filepath'],
+                                   codec=item.get('audio_codec') or self.audio_codec)
+                return
+            self.jobs[index]['status'] = 'done' if ok else 'error'
+            self._persist_later()
+            self._emit('finished', index, ok, msg)
+
+    def _post_process(self, index, task, **kwargs):
+        # сетевой слот уже свободен, ffmpeg работает в отдельном пуле
+        self.jobs[index]['status'] = 'postprocessing'
+        self._post_jobs.add(index)
+        self._post.submit(task, index, **kwargs)
+        self._emit('status', index, "Ожидает обработки")
+
+    def _handle_post(self, kind, index, data):
+        if index not in self._post_jobs:
+            return
+        if kind == 'pp_status':
+            self._emit('status', index, data.get('text', ''))
+            return
+        self._post_jobs.discard(index)
+        ok = bool(data.get('ok'))
+        item = self.jobs[index]
+        if data.get('filepath'):
+            item['_filepath'] = data['filepath']
+        item['status'] = 'done' if ok else 'error'
+        self._persist_later()
+        if ok:
+            self._emit('status', index, f"Файл готов: {item['_filepath']}")
+        else:
+            # GUI следит за статусом, без него строка так и осталась бы на «Сведение дорожек»
+            self._emit('status', index, f"Ошибка: {data.get('message', '')}")
+        self._emit('finished', index, ok, data.get('message', ''))
+
+    def _handle_progress(self, kind, index, data):
+        if kind == 'status':
+            self._emit('status', index, data.get('text', ''))
+            return
+        state, downloaded, total, _speed, _eta, fn = data
+        if state == PROGRESS_DOWNLOADING:
+            percent = (downloaded / total * 100) if total else 0.0
+            self.jobs[index]['progress'] = percent
+            self._emit('progress', index, percent)
+            self._emit('status', index, f"Загружено: {percent:.2f}%")
+        elif state == PROGRESS_FINISHED:
+            self.jobs[index]['progress'] = 100.0
+            if fn:
+                self.jobs[index]['_filepath'] = fn
+            self._emit('progress', index, 100.0)
+            self._emit('status', index, f"Файл готов: {fn}" if fn else "Файл готов")
@@ -0,0 +1,163 @@
+DEFAULT_PROFILE = 'best'
+
+# max_height, max_size (байты), vcodecs/acodecs (по убыванию предпочтения), audio_only, no_remux
+PROFILES = {
+    'best': {'title': 'Лучшее качество'},
+    '1080p': {'title': 'До 1080p', 'max_height': 1080},
+    '720p': {'title': 'До 720p, h264', 'max_height': 720, 'vcodecs': ['h264', 'vp9', 'av1']},
+    'compatible': {'title': 'MP4 без перепаковки', 'max_height': 1080, 'vcodecs': ['h264'], 'acodecs': ['aac'],
+                   'no_remux': True},
+    'small': {'title': 'До 200 МБ', 'max_height': 1080, 'max_size': 200 * 1024 * 1024},
+    'audio': {'title': 'Только звук', 'audio_only': True, 'acodecs': ['opus', 'aac']},
+}
+
+_VCODECS = (('avc', 'h264'), ('h264', 'h264'), ('vp09', 'vp9'), ('vp9', 'vp9'), ('av01', 'av1'),
+            ('hev', 'h265'), ('hvc', 'h265'), ('h265', 'h265'))
+_ACODECS = (('mp4a', 'aac'), ('aac', 'aac'), ('opus', 'opus'), ('vorbis', 'vorbis'), ('mp3', 'mp3'),
+            ('ac-3', 'ac3'), ('ec-3', 'eac3'))
+_MP4_FAMILY = ('mp4', 'm4a', 'mov')
+
+FORMAT_FIELDS = ('format_id', 'ext', 'vcodec', 'acodec', 'height', 'fps', 'tbr', 'protocol')
+
+
+def summarize_formats(info):
+    # в кэш уходит только то, что нужно для ранжирования
+    formats = []
+    for f in info.get('formats') or ():
+        if f.get('vcodec') == 'none' and f.get('acodec') == 'none':
+            continue
+        entry = {k: f.get(k) for k in FORMAT_FIELDS}
+        entry['filesize'] = f.get('filesize') or f.get('filesize_approx')
+        formats.append(entry)
+    return formats
+
+
+def _codec(name, table):
+    name = (name or '').lower()
+    if name in ('', 'none'):
+        return None
+    for prefix, codec in table:
+        if name.startswith(prefix):
+            return codec
+    return name.split('.')[0]
+
+
+def _has_video(f):
+    # неизвестный кодек (None) считаем присутствующим: так описаны прямые ссылки на файл
+    return f.get('vcodec') != 'none'
+
+
+def _has_audio(f):
+    return f.get('acodec') != 'none'
+
+
+def _size(f, duration):
+    if f.get('filesize'):
+        return f['filesize']
+    if f.get('tbr') and duration:
+        return int(f['tbr'] * 1000 / 8 * duration)
+    return None
+
+
+def _preference(codec, preferred):
+    preferred = preferred or ()
+    return len(preferred) - preferred.index(codec) if codec in preferred else 0
+
+
+def _container(video, audio):
+    if audio is None:
+        return video['ext'], None
+    if video['ext'] in _MP4_FAMILY and audio['ext'] in _MP4_FAMILY:
+        return 'mp4', 'mp4'
+    if video['ext'] == audio['ext'] == 'webm':
+        return 'webm', 'webm'
+    return 'mkv', 'mkv'
+
+
+def get_profile(name, custom=None):
+    profiles = dict(PROFILES)
+    profiles.update(custom or {})
+    return profiles.get(name) or profiles[DEFAULT_PROFILE]
+
+
+def _candidates(formats, profile):
+    video = [f for f in formats if _has_video(f) and not _has_audio(f)]
+    audio = [f for f in formats if _has_audio(f) and not _has_video(f)]
+    muxed = [f for f in formats if _has_video(f) and _has_audio(f)]
+    if profile.get('audio_only'):
+        return [(f, None) for f in audio] or [(f, None) for f in muxed]
+    pairs = [(v, a) for v in video for a in audio]
+    return pairs + [(f, None) for f in muxed]
+
+
+def select_format(info, profile_name=DEFAULT_PROFILE, custom=None):
+    profile = get_profile(profile_name, custom)
+    formats = info.get('formats') or []
+    if not formats:
+        return None
+    duration = info.get('duration')
+    max_height = profile.get('max_height')
+    max_size = profile.get('max_size')
+    audio_only = profile.get('audio_only')
+
+    ranked = []
+    for video, audio in _candidates(formats, profile):
+        ext, merge = _container(video, audio)
+        sizes = [_size(f, duration) for f in (video, audio) if f is not None]
+        size = sum(sizes) if all(sizes) else None
+        main_audio = audio or video
+        fits = (
+            (audio_only or not max_height or (video.get('height') or 0) <= max_height)
+            and (not max_size or (size is not None and size <= max_size))
+            and (not profile.get('no_remux') or audio is None or merge != 'mkv')
+        )
+        vcodec = None if audio_only else _codec(video.get('vcodec'), _VCODECS)
+        acodec = _codec(main_audio.get('acodec'), _ACODECS)
+        score = (
+            fits,
+            0 if audio_only else (video.get('height') or 0),
+            _preference(vcodec, profile.get('vcodecs')),
+            0 if audio_only else (video.get('fps') or 0),
+            _preference(acodec, profile.get('acodecs')),
+            audio is None if profile.get('no_remux') else 0,
+            # при равном качестве - пара, которую не придётся сводить в mkv
+            merge != 'mkv',
+            0 if audio_only else (video.get('tbr') or 0),
+            main_audio.get('tbr') or 0,
+            -(size or 0),
+        )
+        ranked.append((score, video, audio, ext, merge, size, vcodec, acodec))
+    if not ranked:
+        return None
+    if not any(r[0][0] for r in ranked):
+        # ничего не подошло под ограничения - берём самый лёгкий вариант
+        ranked.sort(key=lambda r: (r[5] is None, r[5] or 0, r[1].get('height') or 0))
+        best = ranked[0]
+    else:
+        best = max(ranked, key=lambda r: r[0])
+    _, video, audio, ext, merge, size, vcodec, acodec = best
+    spec = f"{video['format_id']}+{audio['format_id']}" if audio else video['format_id']
+    parts = []
+    if not audio_only and video.get('height'):
+        parts.append(f"{video['height']}p")
+    parts.append(' + '.join(c for c in (vcodec, acodec) if c))
+    parts.append(ext)
+    if size:
+        parts.append(f"~{size / 1024 / 1024:.0f} МБ")
+    return {'profile': profile_name, 'format': spec, 'merge': merge, 'ext': ext, 'filesize': size,
+            'label': ', '.join(p for p in parts if p)}
+
+
+def profile_spec(profile_name=DEFAULT_PROFILE, custom=None):
+    # запасной вариант, когда сведений о форматах нет: строка формата для yt-dlp по тем же правилам
+    profile = get_profile(profile_name, custom)
+    if profile.get('audio_only'):
+        return 'ba/b'
+    height = f"[height<={profile['max_height']}]" if profile.get('max_height') else ''
+    size = f"[filesize<{profile['max_size']}]" if profile.get('max_size') else ''
+    if profile.get('no_remux'):
+        specs = [f"bv*{height}[ext=mp4]+ba[ext=m4a]", f"b{height}[ext=mp4]", f"b{height}"]
+    else:
+        specs = [f"bv*{height}{size}+ba", f"b{height}{size}", f"bv*{height}+ba"]
+    specs.append('b')
+    return '/'.join(dict.fromkeys(specs))
@@ -0,0 +1,111 @@
+import json
+import os
+import sqlite3
+import time
+
+HISTORY_DB = "history.sqlite3"
+LEGACY_HISTORY = "history.json"
+
+
+def _fts_query(text):
+    # каждое слово ищется по префиксу, кавычки внутри слова удваиваются
+    return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in text.split())
+
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_DB, limit=50, legacy_path=LEGACY_HISTORY):
+        self.path = path
+        self.limit = limit
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS history ("
+                           "id INTEGER PRIMARY KEY, url TEXT NOT NULL, title TEXT NOT NULL, added REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS history_url ON history (url)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS history_added ON history (added)")
+        try:
+            # полнотекстовый индекс по названиям ведут триггеры, сама история только дописывается
+            self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5("
+                               "title, content='history', content_rowid='id')")
+            self._conn.execute("CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN "
+                               "INSERT INTO history_fts (rowid, title) VALUES (new.id, new.title); END")
+            self._conn.execute("CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN "
+                               "INSERT INTO history_fts (history_fts, rowid, title) "
+                               "VALUES ('delete', old.id, old.title); END")
+            self.fts = True
+        except sqlite3.OperationalError:
+            # sqlite без FTS5 - ищем через LIKE
+            self.fts = False
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        if not self._count and legacy_path and os.path.exists(legacy_path):
+            self._import(legacy_path)
+
+    def _import(self, legacy_path):
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except Exception:
+            return
+        now = time.time()
+        rows = [(e.get('url', ''), e.get('title') or 'Без названия', now)
+                for e in entries if isinstance(e, dict) and e.get('url')]
+        self._conn.executemany("INSERT INTO history (url, title, added) VALUES (?, ?, ?)", rows)
+        self._conn.commit()
+        self._count += len(rows)
+        self.trim()
+        os.replace(legacy_path, legacy_path + ".imported")
+
+    def add(self, url, title):
+        now = time.time()
+        cur = self._conn.execute("INSERT INTO history (url, title, added) VALUES (?, ?, ?)", (url, title, now))
+        self._count += 1
+        self.trim(commit=False)
+        self._conn.commit()
+        return {'id': cur.lastrowid, 'url': url, 'title': title, 'added': now}
+
+    def trim(self, limit=None, commit=True):
+        limit = self.limit if limit is None else limit
+        if not limit or self._count <= limit:
+            return 0
+        # самые старые записи уходят пачкой по первичному ключу, без перебора всей таблицы
+        row = self._conn.execute("SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?", (limit,)).fetchone()
+        cur = self._conn.execute("DELETE FROM history WHERE id <= ?", (row[0],))
+        self._count -= cur.rowcount
+        if commit:
+            self._conn.commit()
+        return cur.rowcount
+
+    def recent(self, limit=None):
+        rows = self._conn.execute("SELECT id, url, title, added FROM history ORDER BY added DESC, id DESC LIMIT ?",
+                                  (limit or self.limit or -1,))
+        return [self._entry(r) for r in rows]
+
+    def find(self, url):
+        rows = self._conn.execute("SELECT id, url, title, added FROM history WHERE url = ? ORDER BY added DESC",
+                                  (url,))
+        return [self._entry(r) for r in rows]
+
+    def search(self, text, limit=None):
+        text = text.strip()
+        if not text:
+            return self.recent(limit)
+        if '://' in text:
+            return self.find(text)[:limit or None]
+        if self.fts:
+            rows = self._conn.execute("SELECT h.id, h.url, h.title, h.added FROM history_fts "
+                                      "JOIN history h ON h.id = history_fts.rowid "
+                                      "WHERE history_fts MATCH ? ORDER BY h.added DESC LIMIT ?",
+                                      (_fts_query(text), limit or -1))
+        else:
+            rows = self._conn.execute("SELECT id, url, title, added FROM history WHERE title LIKE ? "
+                                      "ORDER BY added DESC LIMIT ?", (f"%{text}%", limit or -1))
+        return [self._entry(r) for r in rows]
+
+    @staticmethod
+    def _entry(row):
+        return {'id': row[0], 'url': row[1], 'title': row[2], 'added': row[3]}
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self):
+        return self._count
@@ -0,0 +1,89 @@
+from urllib.parse import urlparse, parse_qs, urlencode
+
+from func.scheduler import host_of
+
+_YOUTUBE_PATHS = ('/shorts/', '/embed/', '/live/', '/v/')
+
+
+def _youtube_id(host, parsed):
+    if host == 'youtube.com':
+        if parsed.path == '/watch':
+            return (parse_qs(parsed.query).get('v') or [None])[0]
+        for prefix in _YOUTUBE_PATHS:
+            if parsed.path.startswith(prefix):
+                return parsed.path[len(prefix):].split('/')[0] or None
+    return None
+
+
+def normalize_url(url):
+    url = url.strip()
+    parsed = urlparse(url if '//' in url else '//' + url)
+    host = host_of(url)
+    if host in ('youtube.com', 'music.youtube.com'):
+        video_id = _youtube_id('youtube.com', parsed)
+        if video_id:
+            return f'youtube.com/watch?v={video_id}'
+    if (parsed.hostname or '').lower() == 'youtu.be':
+        video_id = parsed.path.strip('/').split('/')[0]
+        if video_id:
+            return f'youtube.com/watch?v={video_id}'
+    query = sorted((k, v) for k, vs in parse_qs(parsed.query).items()
+                   if not k.startswith('utm_') for v in vs)
+    path = parsed.path.rstrip('/')
+    return host + path + ('?' + urlencode(query) if query else '')
+
+
+def _dedupe_key(key, variant=None):
+    # одна ссылка может стоять в очереди и как видео, и как звук
+    return f'{key}#{variant}' if variant else key
+
+
+class JobRegistry:
+    def __init__(self):
+        self._jobs = {}
+        self._by_key = {}
+        self._next_id = 0
+
+    def add(self, url, variant=None):
+        key = normalize_url(url)
+        job_id = self._by_key.get(_dedupe_key(key, variant))
+        if job_id is not None:
+            return 0, job_id
+        job_id = self._next_id
+        self._next_id += 1
+        self._jobs[job_id] = {'id': job_id, 'url': url, 'key': key, 'status': 'queued',
+                              'title': None, 'filepath': None}
+        if variant:
+            self._jobs[job_id]['variant'] = variant
+        self._by_key[_dedupe_key(key, variant)] = job_id
+        return 1, job_id
+
+    def find(self, url, variant=None):
+        return self._by_key.get(_dedupe_key(normalize_url(url), variant))
+
+    def get(self, job_id, default=None):
+        return self._jobs.get(job_id, default)
+
+    def remove(self, job_id):
+        item = self._jobs.pop(job_id, None)
+        if item is not None:
+            self._by_key.pop(_dedupe_key(item['key'], item.get('variant')), None)
+        return item
+
+    def ids(self):
+        return list(self._jobs)
+
+    def values(self):
+        return self._jobs.values()
+
+    def __getitem__(self, job_id):
+        return self._jobs[job_id]
+
+    def __contains__(self, job_id):
+        return job_id in self._jobs
+
+    def __iter__(self):
+        return iter(self._jobs.values())
+
+    def __len__(self):
+        return len(self._jobs)
@@ -1,52 +1,46 @@
-import os
-import multiprocessing as mp
+import queue
+import threading
 from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
+from func.engine import DownloadEngine
 
-def _info_worker(index, url, q):
-    try:
-        import yt_dlp
-        ydl_opts = {'quiet': True, 'no_warnings': True, 'noplaylist': True}
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-        q.put(('info_ok', index, {'info': info}))
-    except Exception as e:
-        q.put(('info_err', index, {'message': str(e)}))
-
-
-def _download_worker(index, url, out_dir, proxy, q, filename):
-    try:
-        import yt_dlp
-        def hook(d):
-            payload = {
-                'status': d.get('status'),
-                'downloaded_bytes': d.get('downloaded_bytes'),
-                'total_bytes': d.get('total_bytes'),
-                'total_bytes_estimate': d.get('total_bytes_estimate'),
-                'speed': d.get('speed'),
-                'eta': d.get('eta'),
-                'filename': d.get('filename'),
-            }
-            q.put(('progress', index, payload))
-
-        ydl_opts = {
-            'outtmpl': os.path.join(out_dir, filename),
-            'format': 'bestvideo+bestaudio/best',
-            'merge_output_format': 'webm',
-            'noplaylist': True,
-            'progress_hooks': [hook],
-            'quiet': True,
-            'no_warnings': False,
-        }
-        if proxy:
-            print(proxy)
-            ydl_opts['proxy'] = proxy
-        q.put(('status', index, {'text': 'Начало загрузки'}))
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-        q.put(('done', index, {'ok': True, 'message': 'Загрузка завершена'}))
-    except Exception as e:
-        q.put(('done', index, {'ok': False, 'message': str(e)}))
+
+class _QueueReader(QObject):
+    batch_ready = pyqtSignal(list)
+
+    def __init__(self, q, max_batch=256):
+        super().__init__()
+        self._q = q
+        self._max_batch = max_batch
+        self._thread = threading.Thread(target=self._run, name='DownloadQueueReader', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        if self._thread.is_alive():
+            self._q.put(None)
+            self._thread.join(timeout=timeout)
+
+    def _run(self):
+        # блокируется на очереди и будит GUI-поток только когда есть сообщения
+        while True:
+            try:
+                batch = [self._q.get()]
+            except (EOFError, OSError):
+                return
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            if stop:
+                batch = batch[:batch.index(None)]
+            if batch:
+                self.batch_ready.emit(batch)
+            if stop:
+                return
 
 
 class DownloadManager(QObject):
@@ -55,126 +49,94 @@ class DownloadManager(QObject):
     progress_changed = pyqtSignal(int, float)
     status_changed = pyqtSignal(int, str)
     finished_signal = pyqtSignal(int, bool, str)
+    playlist_entries = pyqtSignal(int, list)
+    playlist_finished = pyqtSignal(int, bool, str)
 
-    def __init__(self, out_dir='.', proxy=None, poll_interval_ms=80):
+    def __init__(self, **kwargs):
         super().__init__()
+        self.engine = DownloadEngine(call_later=self._call_later, **kwargs)
+        self.engine.connect('info', self.info_received.emit)
+        self.engine.connect('info_error', self.info_error.emit)
+        self.engine.connect('progress', self.progress_changed.emit)
+        self.engine.connect('status', self.status_changed.emit)
+        self.engine.connect('finished', self.finished_signal.emit)
+        self.engine.connect('playlist_entries', self.playlist_entries.emit)
+        self.engine.connect('playlist_finished', self.playlist_finished.emit)
+        self._reader = _QueueReader(self.engine.results)
+        self._reader.batch_ready.connect(self.engine.handle_batch)
+        self._reader.start()
+
+    @staticmethod
+    def _call_later(delay, callback):
+        QTimer.singleShot(int(delay * 1000), callback)
+
+    @property
+    def jobs(self):
+        return self.engine.jobs
+
+    @property
+    def cache(self):
+        return self.engine.cache
+
+    @property
+    def scheduler(self):
+        return self.engine.scheduler
+
+    @property
+    def out_dir(self):
+        return self.engine.out_dir
+
+    @out_dir.setter
+    def out_dir(self, value):
+        self.engine.out_dir = value
+
+    @property
+    def proxy(self):
+        return self.engine.proxy
+
+    @proxy.setter
+    def proxy(self, value):
+        self.engine.proxy = value
 
-        if mp.current_process().name == 'MainProcess':
-            mp.freeze_support()
-
-        self.queue = []
-        self.out_dir = out_dir
-        self.proxy = proxy
-        self._mp_queue = mp.Queue()
-        self._info_procs = {}
-        self._download_procs = {}
-        self._timer = QTimer()
-        self._timer.timeout.connect(self._poll_queue)
-        self._timer.start(poll_interval_ms)
-
-    def add_video(self, url):
-        item = {'url': url, 'status': 'queued', 'title': None, 'filepath': None}
-        existing_index = None
-        for i, existing_item in enumerate(self.queue):
-            if existing_item['url'] == url:
-                existing_index = i
-                break
-        if existing_index is not None:
-            return 0, existing_index
-        self.queue.append(item)
-        return 1, len(self.queue) - 1
-
-    def get_info(self, index):
-        if not (0 <= index < len(self.queue)):
-            raise IndexError("Индекс вне диапазона очереди")
-        if index in self._info_procs:
-            return
-        url = self.queue[index]['url']
-
-        ctx = mp.get_context('spawn')
-        p = ctx.Process(target=_info_worker, args=(index, url, self._mp_queue), daemon=True)
-        p.start()
-        self._info_procs[index] = p
+    def add_video(self, url, mode='video', outtmpl=None):
+        return self.engine.add_video(url, mode, outtmpl)
+
+    def remove_video(self, index):
+        return self.engine.remove_video(index)
+
+    def restore(self):
+        return self.engine.restore()
+
+    def get_info(self, index, save_json=False, refresh=False):
+        self.engine.get_info(index, save_json=save_json, refresh=refresh)
+
+    def expand_playlist(self, url, mode='video', outtmpl=None):
+        return self.engine.expand_playlist(url, mode, outtmpl)
+
+    def stop_playlist(self, playlist_id):
+        self.engine.stop_playlist(playlist_id)
 
     def start_download(self, index):
-        if not (0 <= index < len(self.queue)):
-            raise IndexError("Индекс вне диапазона очереди")
-        if index in self._download_procs:
-            return
-        url = self.queue[index]['url']
-
-        ctx = mp.get_context('spawn')
-        p = ctx.Process(target=_download_worker, args=(index, url, self.out_dir, self.proxy,
-                                                       self._mp_queue, self.queue[index].get('_filename')), daemon=True)
-        p.start()
-        self._download_procs[index] = p
-        self.queue[index]['status'] = 'downloading'
-        self.status_changed.emit(index, "Запущено")
+        self.engine.start_download(index)
 
     def stop_download(self, index):
-        p = self._download_procs.get(index)
-        if p and p.is_alive():
-            try:
-                p.terminate()
-            except Exception:
-                pass
-            finally:
-                p.join(timeout=1.0)
-                self._download_procs.pop(index, None)
-                self.queue[index]['status'] = 'stopped'
-                self.status_changed.emit(index, "Остановлен")
-                self.finished_signal.emit(index, False, "Остановлено пользователем")
-
-    def _poll_queue(self):
-        try:
-            while True:
-                kind, index, data = self._mp_queue.get_nowait()
-                if kind == 'info_ok':
-                    info = data['info']
-                    self.queue[index]['title'] = info.get('title', 'Без названия')
-                    self.info_received.emit(index, info)
-                    self._cleanup_info_proc(index)
-                elif kind == 'info_err':
-                    self.info_error.emit(index, data.get('message', 'Ошибка'))
-                    self._cleanup_info_proc(index)
-                elif kind == 'status':
-                    self.status_changed.emit(index, data.get('text', ''))
-                elif kind == 'progress':
-                    st = data.get('status')
-                    if st == 'downloading':
-                        total = data.get('total_bytes') or data.get('total_bytes_estimate') or 0
-                        downloaded = data.get('downloaded_bytes') or 0
-                        percent = (downloaded / total * 100) if total else 0.0
-                        self.progress_changed.emit(index, percent)
-                        self.status_changed.emit(index, f"Загружено: {percent:.2f}%")
-                    elif st == 'finished':
-                        fn = data.get('filename')
-                        self.progress_changed.emit(index, 100.0)
-                        self.status_changed.emit(index, f"Файл готов: {fn}" if fn else "Файл готов")
-                elif kind == 'done':
-                    ok = bool(data.get('ok'))
-                    msg = data.get('message', '')
-                    self._cleanup_download_proc(index)
-                    if not ok and self.queue[index].get('status') == 'stopped':
-                        continue
-                    self.finished_signal.emit(index, ok, msg)
-        except Exception:
-            pass
-
-    def _cleanup_info_proc(self, index):
-        p = self._info_procs.pop(index, None)
-        if p:
-            try:
-                if p.is_alive():
-                    p.join(timeout=0.5)
-            except Exception:
-                pass
-
-    def _cleanup_download_proc(self, index):
-        p = self._download_procs.pop(index, None)
-        if p:
-            try:
-                if p.is_alive():
-                    p.join(timeout=0.5)
-            except Exception:
-                pass
+        self.engine.stop_download(index)
+
+    def configure_limits(self, max_downloads=None, host_limits=None):
+        self.engine.configure_limits(max_downloads, host_limits)
+
+    def configure_bandwidth(self, limit=None, job_limit=None, schedule=None):
+        self.engine.configure_bandwidth(limit, job_limit, schedule)
+
+    def set_job_limit(self, index, rate):
+        self.engine.set_job_limit(index, rate)
+
+    def set_format_profile(self, name, index=None):
+        self.engine.set_format_profile(name, index)
+
+    def configure_transfer(self, fragments=None, connections=None):
+        self.engine.configure_transfer(fragments, connections)
+
+    def shutdown(self):
+        self.engine.shutdown()
+        self._reader.stop()
@@ -0,0 +1,255 @@
+import multiprocessing as mp
+import queue
+import threading
+
+from func.bandwidth import Throttle, TokenBucket
+from func.workers import _info_worker, _download_worker, _playlist_worker
+
+TASKS = {
+    'info': _info_worker,
+    'download': _download_worker,
+    'playlist': _playlist_worker,
+}
+CANCELLABLE = ('download', 'playlist')
+THROTTLED = ('download',)
+# значение флага отмены у брошенного потока: доделав задачу, он завершается
+RETIRED = -2
+
+
+def _pool_worker(worker_id, tasks, results, cancel, handlers=None, limits=None):
+    handlers = handlers or TASKS
+    if handlers is TASKS:
+        # yt_dlp импортируется один раз на процесс, а не на каждую ссылку
+        import yt_dlp  # noqa: F401
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        kind, index, kwargs = task
+        results.put(('started', index, {'worker': worker_id, 'kind': kind}))
+        try:
+            if kind in CANCELLABLE:
+                kwargs['cancel'] = cancel
+            rate_limit = kwargs.pop('rate_limit', 0)
+            if kind in THROTTLED and limits is not None:
+                # общий бакет держит суммарный лимит, бакет воркера - лимит этой задачи
+                total, own = limits
+                own.rate = rate_limit
+                kwargs['throttle'] = Throttle(total, own)
+            handlers[kind](index, q=results, **kwargs)
+        finally:
+            results.put(('idle', index, {'worker': worker_id, 'kind': kind}))
+        if cancel.value == RETIRED:
+            break
+
+
+class WorkerPool:
+    def __init__(self, size=4, results=None, handlers=None):
+        # handlers позволяет подменить yt-dlp (например, фейковым экстрактором в тестах)
+        self.size = max(1, int(size))
+        self.handlers = dict(handlers) if handlers else None
+        self._ctx = mp.get_context('spawn')
+        self._tasks = self._make_queue()
+        self.results = results if results is not None else self._make_queue()
+        self._workers = {}
+        self._cancel = {}
+        self._buckets = {}
+        self.bandwidth = TokenBucket(ctx=self._ctx)
+        self._running = {}
+        self._cancelled = set()
+        self._pending = {}
+        self._outstanding = 0
+        self._next_id = 0
+
+    def submit(self, kind, index, **kwargs):
+        if kind not in (self.handlers or TASKS):
+            raise ValueError(f"Неизвестный тип задачи: {kind}")
+        self._cancelled.discard((kind, index))
+        self._pending[(kind, index)] = self._pending.get((kind, index), 0) + 1
+        self._outstanding += 1
+        self._ensure_workers()
+        self._tasks.put((kind, index, kwargs))
+
+    def cancel(self, index, kind='download'):
+        key = (kind, index)
+        worker_id = self._running.get(key)
+        if worker_id is None:
+            self._cancelled.add(key)
+            return
+        self._cancel[worker_id].value = index
+
+    def set_rate(self, index, rate, kind='download'):
+        # меняет лимит уже идущей задачи; новым задачам лимит передаётся в submit
+        worker_id = self._running.get((kind, index))
+        if worker_id is not None:
+            self._buckets[worker_id].rate = rate
+
+    def is_running(self, index, kind='download'):
+        return (kind, index) in self._running
+
+    def is_busy(self, index, kind='download'):
+        return (kind, index) in self._pending
+
+    def terminate(self, index, kind='download'):
+        worker_id = self._running.pop((kind, index), None)
+        if worker_id is None:
+            return False
+        p = self._workers.pop(worker_id, None)
+        self._cancel.pop(worker_id, None)
+        self._buckets.pop(worker_id, None)
+        if p is not None:
+            self._kill(p)
+        self._release((kind, index))
+        self._ensure_workers()
+        return True
+
+    def handle(self, kind, index, data):
+        if kind == 'started':
+            worker_id = data['worker']
+            if worker_id not in self._workers:
+                return
+            key = (data['kind'], index)
+            self._running[key] = worker_id
+            if key in self._cancelled:
+                self._cancelled.discard(key)
+                self._cancel[worker_id].value = index
+        elif kind == 'idle':
+            worker_id = data['worker']
+            if worker_id not in self._workers:
+                return
+            self._running.pop((data['kind'], index), None)
+            self._cancel[worker_id].value = -1
+            self._release((data['kind'], index))
+
+    def _release(self, key):
+        left = self._pending.get(key, 0) - 1
+        if left > 0:
+            self._pending[key] = left
+        else:
+            self._pending.pop(key, None)
+        self._outstanding = max(0, self._outstanding - 1)
+
+    def shutdown(self, timeout=1.0):
+        for _ in self._workers:
+            self._tasks.put(None)
+        for p in self._workers.values():
+            p.join(timeout=timeout)
+            if p.is_alive():
+                self._kill(p)
+        self._workers.clear()
+        self._cancel.clear()
+        self._buckets.clear()
+        self._running.clear()
+        self._pending.clear()
+
+    def _ensure_workers(self):
+        for worker_id, p in list(self._workers.items()):
+            if not p.is_alive():
+                self._workers.pop(worker_id, None)
+                self._cancel.pop(worker_id, None)
+                self._buckets.pop(worker_id, None)
+        needed = min(self.size, self._outstanding)
+        while len(self._workers) < needed:
+            worker_id = self._next_id
+            self._next_id += 1
+            cancel = self._make_cancel()
+            bucket = TokenBucket(ctx=self._ctx)
+            self._workers[worker_id] = self._spawn(worker_id, cancel, (self.bandwidth, bucket))
+            self._cancel[worker_id] = cancel
+            self._buckets[worker_id] = bucket
+
+    def _make_queue(self):
+        return self._ctx.Queue()
+
+    def _make_cancel(self):
+        return self._ctx.Value('i', -1)
+
+    def _spawn(self, worker_id, cancel, limits):
+        p = self._ctx.Process(target=_pool_worker,
+                              args=(worker_id, self._tasks, self.results, cancel, self.handlers, limits),
+                              daemon=True)
+        p.start()
+        return p
+
+    def _kill(self, p):
+        try:
+            p.terminate()
+        except Exception:
+            pass
+        finally:
+            p.join(timeout=1.0)
+
+
+class _CancelFlag:
+    # то же, что mp.Value('i'), но для воркеров внутри процесса
+    def __init__(self):
+        self.value = -1
+
+
+class ThreadPool(WorkerPool):
+    # для задач, упирающихся в сеть: потоки дешевле процессов, но их нельзя убить
+    def _make_queue(self):
+        return queue.Queue()
+
+    def _make_cancel(self):
+        return _CancelFlag()
+
+    def _spawn(self, worker_id, cancel, limits):
+        t = threading.Thread(target=_pool_worker, name=f'pool-worker-{worker_id}',
+                             args=(worker_id, self._tasks, self.results, cancel, self.handlers, limits),
+                             daemon=True)
+        t.start()
+        return t
+
+    def terminate(self, index, kind='download'):
+        # поток не прервать: он освободится сам, когда обработчик заметит флаг отмены
+        if kind in CANCELLABLE:
+            return False
+        # запрос сведений ничего не держит открытым: зависший поток бросаем, его место занимает новый
+        worker_id = self._running.pop((kind, index), None)
+        if worker_id is None:
+            return False
+        self._workers.pop(worker_id, None)
+        self._buckets.pop(worker_id, None)
+        self._cancel.pop(worker_id).value = RETIRED
+        self._release((kind, index))
+        self._ensure_workers()
+        return True
+
+    def _kill(self, t):
+        pass
+
+
+class _InlineWorker:
+    def is_alive(self):
+        return True
+
+    def join(self, timeout=None):
+        pass
+
+
+class InlinePool(ThreadPool):
+    # задачи выполняются прямо в submit; для тестов и отладки с фейковыми обработчиками
+    def __init__(self, size=1, results=None, handlers=None):
+        super().__init__(1, results, handlers)
+
+    def _spawn(self, worker_id, cancel, limits):
+        self._limits = limits
+        return _InlineWorker()
+
+    def submit(self, kind, index, **kwargs):
+        super().submit(kind, index, **kwargs)
+        worker_id = next(iter(self._workers))
+        self._tasks.put(None)
+        _pool_worker(worker_id, self._tasks, self.results, self._cancel[worker_id], self.handlers, self._limits)
+
+    def shutdown(self, timeout=1.0):
+        self._workers.clear()
+        super().shutdown(timeout)
+
+
+EXECUTORS = {
+    'process': WorkerPool,
+    'thread': ThreadPool,
+    'inline': InlinePool,
+}
@@ -0,0 +1,48 @@
+import os
+
+AUDIO_CODECS = ('best', 'aac', 'm4a', 'mp3', 'opus', 'vorbis', 'flac', 'alac', 'wav')
+DEFAULT_AUDIO_CODEC = 'best'
+
+
+def _extract_audio_worker(index, q, path, codec=DEFAULT_AUDIO_CODEC, quality='5', keep_original=False):
+    try:
+        import yt_dlp
+        from yt_dlp.postprocessor import FFmpegExtractAudioPP
+        q.put(('pp_status', index, {'text': 'Извлечение звука'}))
+        with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
+            # 'best' копирует дорожку без перекодирования, если её кодек ложится в аудиоконтейнер
+            pp = FFmpegExtractAudioPP(ydl, preferredcodec=codec, preferredquality=quality)
+            info = {'filepath': path, 'ext': os.path.splitext(path)[1][1:]}
+            leftovers, info = pp.run(info)
+        if not keep_original:
+            for leftover in leftovers:
+                if leftover != info['filepath'] and os.path.exists(leftover):
+                    os.remove(leftover)
+        q.put(('pp_done', index, {'ok': True, 'message': 'Звук извлечён', 'filepath': info['filepath']}))
+    except Exception as e:
+        q.put(('pp_done', index, {'ok': False, 'message': str(e)}))
+
+
+def _merge_worker(index, q, output, formats):
+    try:
+        import yt_dlp
+        from yt_dlp.postprocessor import FFmpegMergerPP
+        q.put(('pp_status', index, {'text': 'Сведение дорожек'}))
+        files = [f['filepath'] for f in formats]
+        with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
+            pp = FFmpegMergerPP(ydl)
+            info = {'filepath': output, 'ext': os.path.splitext(output)[1][1:], 'requested_formats': formats,
+                    '__files_to_merge': files}
+            leftovers, info = pp.run(info)
+        for leftover in leftovers:
+            if leftover != output and os.path.exists(leftover):
+                os.remove(leftover)
+        q.put(('pp_done', index, {'ok': True, 'message': 'Загрузка завершена', 'filepath': output}))
+    except Exception as e:
+        q.put(('pp_done', index, {'ok': False, 'message': str(e)}))
+
+
+POST_TASKS = {
+    'extract_audio': _extract_audio_worker,
+    'merge': _merge_worker,
+}
@@ -0,0 +1,170 @@
+import os
+import queue
+import threading
+import time
+
+CHUNK_SIZE = 4 * 1024 * 1024
+READ_SIZE = 64 * 1024
+MIN_RANGED_SIZE = 2 * CHUNK_SIZE
+CHUNK_RETRIES = 3
+RANGED_SUFFIX = '.ranged.part'
+
+
+class RangesNotSupported(Exception):
+    pass
+
+
+def ranged_format(info):
+    # кусками качаем только одиночный progressive-файл по http(s): DASH/HLS идут через фрагменты yt-dlp
+    if info.get('requested_formats') or info.get('fragments'):
+        return False
+    return info.get('protocol') in ('http', 'https') and bool(info.get('url'))
+
+
+def _request(ydl, url, headers, start, end):
+    from yt_dlp.networking import Request
+    headers = dict(headers or {})
+    headers['Range'] = f'bytes={start}-{end}'
+    # через ydl.urlopen, чтобы работали прокси, куки и заголовки экстрактора
+    response = ydl.urlopen(Request(url, headers=headers))
+    if response.status != 206:
+        response.close()
+        raise RangesNotSupported(f"Сервер не поддерживает Range (HTTP {response.status})")
+    return response
+
+
+def probe_size(ydl, url, headers=None):
+    response = _request(ydl, url, headers, 0, 0)
+    try:
+        total = response.headers.get('Content-Range', '').rpartition('/')[2]
+    finally:
+        response.close()
+    if not total.isdigit():
+        raise RangesNotSupported("Сервер не сообщил размер файла")
+    return int(total)
+
+
+def remove_partial(path):
+    # файл докачан без кусков (одним соединением) - разметка прошлого запуска больше не нужна
+    for leftover in (path + RANGED_SUFFIX, path + RANGED_SUFFIX + '.chunks'):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+
+
+def _load_done(path, size, chunk_size):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            header = f.readline().split()
+            if header != [str(size), str(chunk_size)]:
+                return set()
+            return {int(line) for line in f if line.strip().isdigit()}
+    except OSError:
+        return set()
+
+
+def download_ranges(ydl, url, path, connections, headers=None, hook=None, chunk_size=CHUNK_SIZE, throttle=None):
+    size = probe_size(ydl, url, headers)
+    if size < MIN_RANGED_SIZE:
+        raise RangesNotSupported("Файл слишком мал для загрузки кусками")
+    # своё имя, а не .part yt-dlp: его размеченный на весь размер файл yt-dlp принял бы за докачанный,
+    # а чужой частичный .part без списка кусков затирать нельзя
+    part = path + RANGED_SUFFIX
+    done_path = part + '.chunks'
+    chunks = [(start, min(start + chunk_size, size) - 1) for start in range(0, size, chunk_size)]
+    done = set()
+    if os.path.exists(part) and os.path.getsize(part) == size:
+        done = _load_done(done_path, size, chunk_size)
+    if not done:
+        # файл размечаем сразу целиком, куски пишутся на свои места
+        os.makedirs(os.path.dirname(os.path.abspath(part)), exist_ok=True)
+        with open(part, 'wb') as f:
+            f.truncate(size)
+        with open(done_path, 'w', encoding='utf-8') as f:
+            f.write(f"{size} {chunk_size}\n")
+
+    pending = queue.Queue()
+    for i in range(len(chunks)):
+        if i not in done:
+            pending.put(i)
+    lock = threading.Lock()
+    stop = threading.Event()
+    errors = []
+    received = [sum(chunks[i][1] - chunks[i][0] + 1 for i in done)]
+
+    def fetch():
+        with open(part, 'r+b') as f:
+            while not stop.is_set():
+                try:
+                    i = pending.get_nowait()
+                except queue.Empty:
+                    return
+                start, end = chunks[i]
+                for attempt in range(CHUNK_RETRIES):
+                    written = 0
+                    try:
+                        response = _request(ydl, url, headers, start, end)
+                        try:
+                            f.seek(start)
+                            while start + written <= end:
+                                if stop.is_set():
+                                    return
+                                data = response.read(min(READ_SIZE, end - start - written + 1))
+                                if not data:
+                                    raise OSError("Соединение оборвалось")
+                                f.write(data)
+                                written += len(data)
+                                with lock:
+                                    received[0] += len(data)
+                                if throttle is not None:
+                                    throttle(len(data))
+                        finally:
+                            response.close()
+                        break
+                    except Exception as e:
+                        with lock:
+                            received[0] -= written
+                        if isinstance(e, RangesNotSupported) or attempt == CHUNK_RETRIES - 1:
+                            errors.append(e)
+                            stop.set()
+                            return
+                f.flush()
+                with lock, open(done_path, 'a', encoding='utf-8') as log:
+                    log.write(f"{i}\n")
+
+    threads = [threading.Thread(target=fetch, name=f'range-{n}', daemon=True)
+               for n in range(min(connections, pending.qsize()))]
+    for t in threads:
+        t.start()
+    started = time.monotonic()
+    initial = received[0]
+    try:
+        while True:
+            alive = [t for t in threads if t.is_alive()]
+            if not alive:
+                break
+            alive[0].join(0.2)
+            if hook is not None and not stop.is_set():
+                got = received[0]
+                elapsed = time.monotonic() - started
+                speed = (got - initial) / elapsed if elapsed > 0 else None
+                hook({'status': 'downloading', 'downloaded_bytes': got, 'total_bytes': size, 'speed': speed,
+                      'eta': int((size - got) / speed) if speed else None, 'filename': part,
+                      'throttled': True})
+    except BaseException:
+        # отмена из hook: останавливаем потоки, .part и список готовых кусков остаются для продолжения
+        stop.set()
+        for t in threads:
+            t.join()
+        raise
+    if errors:
+        if isinstance(errors[0], RangesNotSupported):
+            # дальше файл качает yt-dlp, размеченный файл больше не нужен
+            remove_partial(path)
+        raise errors[0]
+    os.replace(part, path)
+    os.remove(done_path)
+    if os.path.exists(path + '.part'):
+        # частичный файл прошлой загрузки одним соединением устарел
+        os.remove(path + '.part')
+    if hook is not None:
+        hook({'status': 'finished', 'downloaded_bytes': size, 'total_bytes': size, 'filename': path})
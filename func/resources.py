@@ -1 +1,120 @@
-bin = b'\x00\x00\x01\x00\x01\x00\x00\x00\x00\x00\x01\x00 \x00\xf7\x0c\x00\x00\x16\x00\x00\x00\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x01\x00\x00\x00\x01\x00\x08\x06\x00\x00\x00\\r\xa8f\x00\x00\x00\x01orNT\x01\xcf\xa2w\x9a\x00\x00\x0c\xb1IDATx\xda\xed\xdd\xcdNUY\x1a\x87q\x075\x01{\xa8h\xab\x130\xd1+\xe8Q\xdf\x80\x03\x9a\x91&\xc5m4\xc5T`\x8av]\x06\x03M\r\x90Jq+h\xc4\x89\xd0J1\xaa\x84bT\xc9\xea\xfd\xe6l\x12\x9aB\xea\xec\xcf\xb3?~O\xf2O\x8c\xcaa\x9f\xb5\xf6\xfb\xec\xb5\xbf\xd6\xbau\x0b\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00 #\x89\xc8\x9f2\xc6\x82\xbf\x9f\xe5\x91\xc8\x88s\x7f\x90B\xb8\xe6\x0b\xdd\xce\xf2 \xcbJ\x96\xad,\xdbY\x0e\xb2\x1ce\xf9,2\xc2\x1c\xe55\xb0\x9d\xd7D\xd4\xc6B\xafep\xcd\xc6\xc7\x17Z\xce\xb2\x97\xe58\xcbY\x96$"\x7f\xcaY.\x84\xd7Y\xfeu\x9d\x0c\xfaT\xfcKY6\xf3/\xa4\xe8E\xca\xc9`3\xaf\xa5\xeeJ\xe0\x9a#~l\xf4\xa1N\x14\xa9%\x87yM-tN\x04W\x8a\xffY\x96}\x1d&\xd2H\xf6\xf3\x1a\xeb\x86\x04\xae\x1c\xf57\xb2\x9c\xe8$\x91Fs\x9a\xe5\xfb,s3\x95\xc0\xa5\xe2\xbf\x93\xe5\xad\x8e\x11i-\xe7Yv\xb2\xdc\x9d\x89\x04\x14\xbfH\'\xf26\xaf\xc1\xf6$\xa0\xf8E:\'\x81vF\x02W\xce\xf9\x15\xbfH7\xb2\xd3\xf85\x81+W\xfb75\xbaH\xa7\xae\t|\xdf\x96\x00^\xd4r\xb5\x7fa!\xa5\x95\x95\x94\xb6\xb6R\xda\xdc\x14\x19_\xd6\xd7Sz\xfa4\xa5{\xf7\xea\xba;\xf0\xac\x11\t\\y\xba\xefS\xe9\x8d\xbc}{\xf2\x85\xe3\xcb\x1f\x1c\xa4tv\x96\x80Q\xf3\xf5kJ\xef\xdfOjbi\xa9\x8e\xe7\x04\x16j\x97\xc0%\x01l\x94\xde\xb8\xc5\xc5\x94vvR:9\xd1\xe9\xc0u\x1c\x1e\xd6!\x82\xcdZ\x05p\xe5)\xbfrC\xff\x17/R\xfa\xf4I\x07\x03\xd3\x10\xb5\x125S\xfe\xb1\xe1\xa5\xda$p\xe9U\xde\xbd\xc2\x1b\x13\xe76\x1b\x1b\x8e\xfa@QNOSz\xfe|\xb6\xa3\x80KG\xff\xa7\xa5\x8e\xfeQ\xfc\x00\xda\x96\xc0\xc1\xc5\xb5\x80\xba\x04P\xfc\xb6_l\xb8#?P]\x02\xc5O\x07\xce\xf298\xaa\x8d\x02.=\xf4sPh\x03\x9e=\x9bl8\x80z\xae\t\x14\xbf0\xb8\x97\x9f\xbaW\x16\xc0J\xa1\t=\xe6\xe6R\xda\xdb\xd3i@\x9d\xc4\xdd\x81b\x028\xce\xa7\xe0ky\xf8\xbf\xbc\x9c\xd2\xf9\xb9\x0e\x03\xea$n\x11\x16\x1b\x05\x9c\xe5\x07\xef\xcaW\xffw\x0b=\xe8\xe3\xe8\x0fte\x14P\xfen@\xfe\x83\x8f\xf2\xa1\xc4t\xbf0\x9e\xf2s\xe1\x0fh\x86xz6\x1e\xa1\x9f^\x00\xbb\xa5\xaf\x03\\\x12\xc0\xe7\xa9\x7fa<\xdb\x0c\xa0\x19\xe2\xd1\xf9x\x7f\xa6\xd8u\x80GU\x04\xf0\xb0\x90\x00^\xbe\xd4I@\x93\xc4\xcbs\xd3\x0b\xe0sU\x01\xc4\x03@_\xa6>\xff\xdf\xdd\xd5A@w\xae\x03T\x16\xc0\xfa\xd4\xbf\xec\xd1\xa3\x94\x8e\x8fu\x10\xd0$1\xcanQ\x00\x9b\x85\x04\xf0\xf9\xb3\x0e\x02\x9a$F\xd91\xda&\x00`\x84\xc4(;j\x8d\x00P\x8a\xb8\x92\x1c\xb7\x93\xb6\xb7\'/kE\xe2\xcf&h\xe9\x07Qc\x04\x80R\xc43\xe5\xab\xab\xd7\xdfK\x8e\xbf\x8b\xa78\xf7\xf7\xb5\x13\x01\x10\xc0\xe0x\xf3f2+\xd3_\xf5\xe3\x9d;)\xbd}\xab\xbd\x08\x80\x00\x06C\x1c\xd5\xa3\xb0\xa7\xed\xcb\xf8\xbfF\x02\x04@\x00\x03 ^\xcc\x8a\xa1}\xd1\xf9\x1c\xbc\xd4E\x00\x040\x00\xe2\xb6\xd1\xfc|q\x01\xc4\xcfx\xb0\x8b\x00\x08\xa0\xe7\xac\xad\x95\x9fa6~\x16\x04@\x00=\xe5\xcb\x97\xc9\x1b\x9ae\x05\x10?\x1b\x9f\x01\x02 \x80\x9e\xee,\x0f\x1f\x96\x17@\xfc\xac>%\x00\x02\x18\xc5\xce\xa2O\t\x80\x00\x08@\x9f\x12\x00\x01\x10\x80>%\x00\x02 \x00}J\x00v\x16\x02\x00\x01\xd8Y\x08\x00\x04`g!\x00\x10\x80\x9d\x85\x00@\x00v\x16\x02\x00\x01\xd8Y\x08\x00\x04`g!\x00\x10\x00\x08\x00\x04\x00\x02\x00\x01\x80\x00@\x00 \x00\x10\x00\x08\x00\x04\x00\x02\x00\x01\x80\x00@\x00 \x00\x10\x00\x08\x00\x04\x00\x02\x00\x01\x80\x00@\x00 \x00\x10\x00\x08\x00\x04\x00\x02\xd0\xa7\x04\x00\x02\xd0\xa7\x04\x00\x02\xd0\xa7\x04\x00\x02\xd0\xa7\x04\x00\x02\xd0\xa7\x04\xd0\x13b\xd9\xedh\xafHSKpwY\x00m|\x7f\x02 \x80\xceqx\x98\xd2\xc6FJO\x9eL\x96\xdf\x8e\xc4\x9f\xe3\xef\xe2\xdf\x86.\x806\xbf?\x01\x10@\xa7x\xf3&\xa5\xc5\xc5o\xb7a\xfc[\xfc\x9f\xa1\n\xa0\xed\xefO\x00\x04\xd0\x19\xf6\xf7S\xbas\xe7\xaf\xdb1\xfe\xcf\xdb\xb7\xc3\x13@|\xa7i\xbf\x7f\xb4\x15\x08`0\x9c\x9f\xa7\xb4\xbc<}\xe1\xd5%\x81\xae\x08`\xda\xe2\xbfH\xb4U\xb4\x19\x08`\x10\xec\xee\xa64?_\xac\xf8\xea\x90@\x17\x04P\xb4\xf8#\xd1V\xd1f \x80A\xf0\xf2e\xb9\x02\xac*\x81Y\x0b\xa0L\xf1_$\xda\x0c\x040\x0867\xcb\x17a\x15\t\xccR\x00U\x8a?\x12m\x06\x02\x18\x04q\x8b\xabl!T\x91\xc0\xac\x04P\xb5\xf8#\xd1f \x80A\xb0\xbd]\xad\x18\xcaJ`\x16\x02\xa8\xa3\xf8#\xd1f \x80A\xf0\xf1\xe3\xcd\xf7\xbf\x9b\x92@\xdb\x02\xa8\xab\xf8\x97\x96&m\x06\x02\x18\x0c;;)\xcd\xcd\xb5+\x816\x05PW\xf1\x1b\xfe\x13\xc0 \x89\xfb\xda\xab\xab\xf5\x14\xc8\xb4\x12hK\x00u\x16\xff\xf3\xe7)\x9d\x9c\xd8_\x08`\x80\xfc\xfa\xebd\x07oK\x02m\x08\xa0\xee\xe2?=\xb5\x9f\x10\xc0\x80\x89\x1d\xbc-\t4-\x00\xc5O\x00\x04\xd0a\t4)\x00\xc5O\x00\x04\xd0q\t4%\x00\xc5O\x00\x04\xd0\x03\t4!\x00\xc5O\x00\x04\xd0\x13\t\xd4-\x00\xc5O\x00\x04\xd0#\t\x1c\x1dU\x17@|\x86\xe2\'\x00\x02\xe8\x99\x04~\xfa)\xa5\xe3\xe3\xea\x02\x88\xcf\x88\xcfR\xfc\x04@\x00=\x92\xc0\xc2BJ?\xfe8\x99s\xaf\xecg\xc4\xcf\xc6g\xc4g)~\x02 \x80\x9eI \x1e=\xfe\xee\xbb\xf2?\x1f?[\xc7\xe3\xcb\x8a\x9f\x000#\tt!\x8a\x9f\x000R\t(~\x02\xc0H%\xa0\xf8\t\x00#\x95\x80\xe2\'\x00\x8cT\x02\x8a\x9f\x000R\t(~\x02\xc0H%\xa0\xf8\t\x00#\x95\x80\xe2\'\x00\x02\x18\xa9\x04\x14?\x01\x10\xc0H%\xa0\xf8\t\x80\x00F*\x01\xc5O\x00\x040R\t(~\x02 \x80\x91J@\xf1\x13\x00\x01\x8cT\x02\x8a\x9f\x00\x08`\xa4\x12P\xfc\x04@\x00#\x95\x80\xe2\'\x00\x02\x18\xa9\x04\x14?\x01\x10\xc0H%\xa0\xf8\t\x80\x00F*\x01\xc5O\x00\x040R\t(~\x02 \x80+|\xf92\xc9\xd0%\xd0\xd7\xe2\xefk\xff\x10@\x879?Oiw7\xa5\xb5\xb5\x94\x9e<\x99\xe4\x87\x1fRz\xf5*\xa5\x8f\x1f\x87\'\x81\xbe\x15\x7f\xf4A\xf4E\xf4\xc9E\xffD_E\x9fE\xdf\x11\x00\x01\x94f\x7f?\xa5\xe5\xe5\x94\xe6\xe7\xaf\xff\xceKK)ml\xa4\xf4\xf5k?\xbe\xcf\xc9\xc9d{c\xbb/\x7f\x8f\xdb\xb7Sz\xfat\xf2o\xf1\x7f\xfa\xc2\x9b7)-.^\xdf7\xd1g\xd1w\xd1\x87\x04@\x00\x85\xf9\xf4\xe9\xdb;\xd7\xd5ln\xf6\xeb\xbb\xc5Qs{{R\xf0/_N\x8e\x96}*\xfc`\xda\xa5\xca\xa2\x0f\xa3/\t\x80\x00\xa6\xe6\xf7\xdfSZ]-\xb6\n\xcf/\xbf\xb8@\xd5\x16\xd1\xd6E\x96*\x8b\xbe\x8c>%\x00\x02\x98\x8a8"\x16]\x11\xe7\xdf\xffV\x98m\x11m]t\x85\xa4\xe8S\x02 \x80\xa9\x88aq\xd1\xdbfq\x0e=\xf4+\xd0] \xda8\xda\xbah\xffD\x9f\x12\x00\x01LE\x9c\xd3\x97YH\xd3s\x10\xed\x14@\x99\x05O\xfbv\x9d\x86\x00z&\x00\x0fBu\xb1\x00\x08\x80\x00\x08\x80\x00\x08\x80\x00\x08\x80\x00\x08\x80\x00\x1a\x15\xc0\xf1\xb1\x02m\x9ahc\x02 \x80\xce\t \x9e\xa6\xfb\xf9g\x05\xda4\xd1\xc6\xd1\xd6\x04@\x00\x9d\x12@\xe4\xd93o\xd05I\xb4m\xb4q\x99\xbe!\x00\x02h\\\x00^\xa3m\xb6\xf8\xab\xccm@\x00\x04\xd0\x8a\x00"/^\xa4\xf4\xe1CJgg\n\xb7*\xd1\x86\xd1\x96\xd1\xa6U\xfa\x84\x00\x08\xa05\x01\\\xbc\x1f\xb0\xb2\x92\xd2\xd6\xd6\xe4\xf3\xa4x\xa2\xed\xa2\r\xa3-\xab\xf6\x07\x01\x10\xc0\xd4\xc4[r]]\x82[\xca%\xfa\x94\x00\x08`*\xe2UYE3\xacD\x9f\x12\x00\x01L\xc5\xc1A=\xc3N\xe9F\xa2/\xa3O\t\x80\x00\xa6\xbe\xf0\x14\xb3\xc9(\x9ea$\xfar(\x17d\t\xa0%\xf6\xf6\x8a\xcf\t \xddK\xf4a\xf4\xe5P \x80\x96(:+\x90t3C\x9a\r\x88\x00Z\xa6\xc8\xbc\x80\xd2\xbd\x0cm>@\x02\x98\x011\xf3l\x91\xf9\xe7\xa4\x1b\x89>\x8b\xbe\x1b\x1a\x040\x03bj\xe9\xb2\xcf\xa0K\xfb\x89\xbe\x1a\xdat\xe0\x040c\xbe5\xa7\xbet\'\x17\xeb4\xf4m\x8as\x02\xe8\x11\x87\x87\x93\x9d,&\xa6,\xf3Z\xaa\xd4\x9b\xcb\x8b\x9aD\xdf\x0c\x1d\x02\xe8\xd0\x88 \xa6\x9a\x8e\xd9f=\xb7?\x9b\xf4uQ\x13\x02\x00@\x00\x00\x08\x00\x00\x01\x00 \x00\x00\x04\x00\x80\x00\x00\x10\x00\x80\xa0\xd8\xc2(\x04\x00\x0c\x8ax\xf0i\xfa\'P+\x0b`\xdd\xd2X@\x87\x88\xa7\x1f\xa7\x7fT\xba\xb2\x00\x9ef\xf92\xf53\xd9a\'\x00\xcdQl\xca\xfa\xca\x02x\x98\x7f\xc8t\xbf0\xec\x04\xa09\xd6\xd7\x8b\x08\xe0\xa8\xaa\x00\x1e\xe5\x1f2\xdd/\x8c\x8d\x03\xd0\x0c_\xbfN\xde|\x9c^\x00\x07Y\xeeW\x11\xc0\xfd\xfcC\xa6\xfb\x85\xb1qcz3\x0bh\x93\xf7\xefS\xbaw\xaf\x88\x00\xb6\xf3:.-\x80\xc8\xabB\xeff\x0fi\x06V\xa0\xbf\xe7\xff\x91\xad:\x04\xf0C\xe19\xd8\xcf\xcfu\x16P\'1\xd9I\xb1\xd9\xa8\xce\xb2\xac\x94*\xfek\xee\x04\x9cL\xfd\x8b\xe7\xe7S\xda\xd9\xd1a\xc0l\x8f\xfe\xc7Y\x1e\xd4!\x80\xdbY\xde\x8d~:f`V\xc4\x04\xa7\xc5\x97\xaa\xdb\xcbk\xb7\xb2\x00"k\x85\xe7j\x8b\xf5\xdcOOu\x1eP\x85\xa8\xa1\xe23R\xc7\xf0\x7f\xb9\xf4\xf9\xff5\x12x\x9c\xe5\xb0\xb0\x04\x9e?\'\x01\xa0J\xf1G\r\x15\x9f,5\xee\xdc-T.\xfe+\xa3\x80\xcdR\xb3\xb6\x92\x00P\x9c8\x85\x8eQt\xb9\xd9\x927k9\xfa_\x11\xc0R\xa9Q\xc0\xd0\x17j\x00\xea&V4*\xbf$\xdd\xa7\xbcV\xeb\x11@-\xa3\x80\x8b5\xda\xe3J\xe6\x18\xe6n\x07\xca\x10\xb5\x115R\xfc\x82\xdfE\xce\xb3\xac\xd6Z\xfcW\x04\x10\xe7\x15\xfb\x95\x16rx\xfc8\xa5\xb5\xb5\x94\xde\xbd\x9b\xbc=8\x94u\xdb\x81\xa2\xc4\xbe\x1f5\x10\xb5\x105\x11\xb5Qm\xa1\x94\x9d,s\xb5\x0b\xe0\x8a\x04\x9e\x15z.\xe0\xa6\xa7\x06\x1f<Hie%\xa5\xad-\x8b\\\xc8\xb8\x12\xfb|\xec\xfbQ\x03\xf5\xac0\x15C\xff\xc5F\x8a\xff\x1a\tlX\x96J\xa43\xf95\xcb\x8bF\x8b\xff\x9aS\x81\xb7\x1a^d\xe6\xf9\xbf\xf3\xfeF\x05pE\x02wH@d\xe6i\xee\xbc\x9f\x04D:}\xe4\x8f\xe2\xbf\xdbj\xf1_#\x81\xbb\xf9\x86\x9c\xeb\x14\x91\xd6\xce\xf9W[?\xf2\xdf \x81\xd8\x90\xef\xb3\x9c\xea\x1c\x91F\xf3\xe9\xf2\x05\xbf\x99\x15\xff5\x12\xb8\xb8E\x18o!\xfd\xae\xa3D\x1a\x19\xf2/v\xa6\xf8\xbf!\x81\xb9|x\xf2!\x7f+I\xe7\x89T+\xfc\xbd\xfc\xed\xbe\xf9\xce\x15\xff\r"X\xc87\xda\x88@\xa4xN.\x15\xfe\\\xa7\x0b\xff\x06\t\\\x8c\x08bj\xa2\xd7\xf9k\x8a_u\xae\xc8\xb5\x89\xdax\x9f\xbfs\xf3\xf4bB\x8f^\x14\xfe\x942\xb8\x97\x7f\xb1\xf5\xfcKn\xe7R8\xca\xd7\x1f\x90f\xf2\xdf,\x7f\x14\xd8\x11\x7f\xd3f\x8d\xe7(\xdf\xf7\xb7\xf3ZX\xcfk\xe3\xde\xd5\xba\xe9=\xe9\xe6\xdc\xcf\xd7\x1f\x90f\x12\xf3\xc2\xfd#\x97\xc0\xb4\x02\xf8O\xbe#j\xbffs\xff\xa6\xda\x184I\xda\xcc\x83B+<M\xde\xf5\xd0n-\x06hR\xb4\x8f\n\n`\xd3N\t\x10\x00\x00\x02\x00@\x00\x00\x08\x00\x00\x01\x00 \x00\x00\x04\x00\x80\x00\x00\x10\x00\x00\x02\x00@\x00\x00\x08\x00\x00\x01\x00 \x00\x00\x04\x00\x80\x00\x00\x10\x00\x00\x02\x00@\x00\x00\x08\x00\x00\x01\x00 \x00\x00\x04\x00\x80\x00\x00\x10\x00\x00\x02\x00@\x00@\x87\x8a\xcf\xe2\xa0\xb7,\x9c\x89q\x17\xfe}\xcb\x83W_:\x1b\xe8S\xf1/dY\xcf\xf2*\xcbA\x96\xa3\xfc(<\x8bD\xf1\xffQ@\x00\xbf\xcdp[?\xe7m\x15m\xf6:\xcbJ\x96y\x12@\x9f\x8a\xff\x9fY\xf6\x0b\x14\x9c|;\xe7Yv\xb2\xdc%\x01\xf4A\x00\x0b\x8a\xbf\x91\xec\\\x8c\x04\x80.\x1f\xfd\xd7\x14kc#\x81\x15\xa3\x00tY\x00\xb7\xb3\xbcS\xac\x8d\xe55\x01\xa0\xcb\x02\x88\xab\xd7\xc7\n\xb5\xb1|\xc8\xf2w\x02\x00\x01\x8c31\xba\xfa\x1b\x01\xa0\xcb\xa7\x00{\n\xb5\xb1l:\x05@\xd7/\x02.\xe7\x17\xac\x14lC\x17\x01\x81.K`>\xbfe\xa5h\xdd\x06\xc4HG\x01w\xf3\x1d\xd6H\xa0z\x0e\xf3\xa1\xff\x82\xe1?\xfa$\x81\xf9|\xc8\xba\x95\xef\xc0R<\xf1(\xf5c\xef\x03\xa0\xaf\x12\x90[\xde\n\x04\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xb8\x99\xff\x013\x91;\x89T\xb1@\xd7\x00\x00\x00\x00IEND\xaeB`\x82'
\ No newline at end of file
+import json
+import mmap
+import os
+import struct
+import sys
+
+# ресурсы лежат в одном бинарном пакете: заголовок, JSON-оглавление и данные подряд
+MAGIC = b'PTLPACK1'
+ROOT = getattr(sys, '_MEIPASS', os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PACK_FILE = os.path.join(ROOT, "resources.pack")
+
+# имя ресурса -> исходный файл в репозитории, из них собирается пакет
+ASSETS = {
+    'app.ico': 'icon.ico',
+}
+
+
+def build(path=PACK_FILE, assets=None, root=ROOT):
+    index = {}
+    blobs = []
+    offset = 0
+    for name, source in sorted((assets or ASSETS).items()):
+        with open(os.path.join(root, source), 'rb') as f:
+            blob = f.read()
+        index[name] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+    header = json.dumps(index, ensure_ascii=False).encode('utf-8')
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+    return index
+
+
+class ResourcePack:
+    def __init__(self, path=PACK_FILE):
+        self.path = path
+        self._map = None
+        self._index = None
+        self._base = 0
+        self._cache = {}
+
+    def _open(self):
+        # файл отображается в память при первом обращении, импорт модуля ничего не читает
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path}: не пакет ресурсов")
+        size = struct.unpack_from('<I', self._map, len(MAGIC))[0]
+        start = len(MAGIC) + 4
+        self._index = json.loads(self._map[start:start + size].decode('utf-8'))
+        self._base = start + size
+
+    def names(self):
+        if self._index is None:
+            self._open()
+        return sorted(self._index)
+
+    def data(self, name):
+        if self._index is None:
+            self._open()
+        offset, size = self._index[name]
+        return self._map[self._base + offset:self._base + offset + size]
+
+    def cached(self, key, make):
+        # разобранный ресурс (байты, QPixmap, QIcon) создаётся один раз
+        if key not in self._cache:
+            self._cache[key] = make()
+        return self._cache[key]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._index = None
+
+
+_pack = None
+
+
+def _default_pack():
+    global _pack
+    if _pack is None:
+        _pack = ResourcePack()
+    return _pack
+
+
+def _read(pack, name):
+    if not os.path.exists(pack.path) and name in ASSETS:
+        # пакет ещё не собран - читаем исходный файл из репозитория
+        with open(os.path.join(ROOT, ASSETS[name]), 'rb') as f:
+            return f.read()
+    return pack.data(name)
+
+
+def data(name):
+    pack = _default_pack()
+    return pack.cached(('data', name), lambda: _read(pack, name))
+
+
+def pixmap(name):
+    from PyQt6.QtGui import QPixmap
+
+    def make():
+        result = QPixmap()
+        result.loadFromData(data(name), os.path.splitext(name)[1][1:] or None)
+        return result
+    return _default_pack().cached(('pixmap', name), make)
+
+
+def icon(name):
+    from PyQt6.QtGui import QIcon
+    return _default_pack().cached(('icon', name), lambda: QIcon(pixmap(name)))
+
+
+if __name__ == '__main__':
+    print(f"{PACK_FILE}: {', '.join(build())}")
@@ -0,0 +1,108 @@
+import itertools
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+HOST_ALIASES = {
+    'youtu.be': 'youtube.com',
+}
+
+
+def host_of(url):
+    host = (urlparse(url if '//' in url else '//' + url).hostname or '').lower()
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return HOST_ALIASES.get(host, host)
+
+
+class DownloadScheduler:
+    def __init__(self, max_active=4, host_limits=None):
+        self.max_active = max(1, int(max_active))
+        self.host_limits = {}
+        # у каждого ключа лимита своя очередь: при занятом хосте не перебираем его ожидающие задачи
+        self._waiting = {}
+        self._queues = {}
+        self._seq = itertools.count()
+        self._active = {}
+        self._per_host = {}
+        self.set_host_limits(host_limits or {})
+
+    def set_host_limits(self, host_limits):
+        self.host_limits = {host_of(k): max(1, int(v)) for k, v in host_limits.items()}
+        # ключи зависят от лимитов: уже поставленные и идущие задачи раскладываем заново
+        waiting = sorted(self._waiting.items(), key=lambda entry: entry[1][2])
+        self._waiting = {}
+        self._queues = {}
+        for index, (_, url, seq) in waiting:
+            self._enqueue(index, url, seq)
+        self._per_host = {}
+        for index, (_, url) in list(self._active.items()):
+            key = self.limit_key(host_of(url))
+            self._active[index] = (key, url)
+            self._per_host[key] = self._per_host.get(key, 0) + 1
+
+    def limit_key(self, host):
+        for key in self.host_limits:
+            if host == key or host.endswith('.' + key):
+                return key
+        return host
+
+    def push(self, index, url):
+        if index in self._active or index in self._waiting:
+            return False
+        self._enqueue(index, url, next(self._seq))
+        return True
+
+    def _enqueue(self, index, url, seq):
+        key = self.limit_key(host_of(url))
+        self._waiting[index] = (key, url, seq)
+        self._queues.setdefault(key, OrderedDict())[index] = seq
+
+    def discard(self, index):
+        entry = self._waiting.pop(index, None)
+        if entry is not None:
+            self._unqueue(entry[0], index)
+            return True
+        entry = self._active.pop(index, None)
+        if entry is None:
+            return False
+        key = entry[0]
+        self._per_host[key] -= 1
+        if not self._per_host[key]:
+            del self._per_host[key]
+        return True
+
+    def is_waiting(self, index):
+        return index in self._waiting
+
+    def _unqueue(self, key, index):
+        waiting = self._queues[key]
+        del waiting[index]
+        if not waiting:
+            del self._queues[key]
+
+    def pop_ready(self):
+        ready = []
+        while len(self._active) < self.max_active:
+            # из ключей со свободными слотами берём самую раннюю задачу, общий порядок очереди сохраняется
+            best = None
+            for key, waiting in self._queues.items():
+                limit = self.host_limits.get(key)
+                if limit is not None and self._per_host.get(key, 0) >= limit:
+                    continue
+                seq = next(iter(waiting.values()))
+                if best is None or seq < best[0]:
+                    best = (seq, key)
+            if best is None:
+                break
+            key = best[1]
+            index = next(iter(self._queues[key]))
+            self._unqueue(key, index)
+            _, url, _ = self._waiting.pop(index)
+            self._active[index] = (key, url)
+            self._per_host[key] = self._per_host.get(key, 0) + 1
+            ready.append(index)
+        return ready
+
+    def __len__(self):
+        return len(self._waiting) + len(self._active)
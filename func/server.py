@@ -0,0 +1,333 @@
+import json
+import logging
+import ntpath
+import os
+import queue
+import re
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+API_HOST = '127.0.0.1'
+API_PORT = 8737
+REQUEST_TIMEOUT = 10.0
+SSE_KEEPALIVE = 15.0
+SSE_BACKLOG = 1000
+
+# API только для локальных программ: Host и Origin проверяются против подмены DNS и запросов со страниц браузера
+LOCAL_HOSTS = ('127.0.0.1', 'localhost')
+
+JOB_FIELDS = ('id', 'url', 'title', 'status', 'progress', 'mode')
+
+
+def job_view(item):
+    view = {k: item.get(k) for k in JOB_FIELDS}
+    view['filepath'] = item.get('_filepath')
+    view['status'] = view['status'] or 'queued'
+    view['progress'] = round(view['progress'] or 0.0, 1)
+    return view
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def check_outtmpl(template):
+    # шаблон из запроса пишет только внутрь папки загрузок: без абсолютных путей, диска, ~ и '..'
+    if template is None:
+        return None
+    if not isinstance(template, str) or not template.strip():
+        raise ApiError(400, "outtmpl должен быть непустой строкой")
+    parts = re.split(r'[\\/]', template)
+    if (template.startswith(('/', '\\', '~')) or ntpath.splitdrive(template)[0] or os.path.isabs(template)
+            or '..' in parts):
+        raise ApiError(400, "outtmpl должен быть путём внутри папки загрузок")
+    return os.path.normpath(template)
+
+
+class ControlServer:
+    # HTTP API живёт в своём потоке, а все обращения к движку выполняет в его потоке
+    def __init__(self, engine, host=API_HOST, port=API_PORT):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self._clients = []
+        self._clients_lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self._subscriptions = []
+
+    @property
+    def address(self):
+        if self._httpd is None:
+            return None
+        return self._httpd.server_address[:2]
+
+    def start(self):
+        if self._httpd is not None:
+            return
+        server = self
+
+        class Handler(ApiHandler):
+            api = server
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        for event in ('info', 'info_error', 'status', 'progress', 'finished'):
+            callback = self._make_listener(event)
+            self.engine.connect(event, callback)
+            self._subscriptions.append((event, callback))
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='control-api', daemon=True)
+        self._thread.start()
+        logger.info("HTTP API запущен на http://%s:%s", *self.address)
+
+    def stop(self):
+        if self._httpd is None:
+            return
+        for event, callback in self._subscriptions:
+            self.engine.disconnect(event, callback)
+        self._subscriptions.clear()
+        with self._clients_lock:
+            for client in self._clients:
+                client.put(None)
+            self._clients.clear()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=2.0)
+        self._httpd = None
+        self._thread = None
+
+    def invoke(self, fn, *args):
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+        self.engine.call_soon_threadsafe(run)
+        return future.result(timeout=REQUEST_TIMEOUT)
+
+    # события движка приходят в его потоке, клиентам SSE раздаём через очереди
+    def _make_listener(self, event):
+        def listener(index, *args):
+            if event == 'progress':
+                payload = {'id': index, 'progress': round(args[0], 1)}
+            elif event == 'status':
+                payload = {'id': index, 'text': args[0]}
+            elif event == 'finished':
+                payload = {'id': index, 'ok': args[0], 'message': args[1]}
+            elif event == 'info':
+                payload = {'id': index, 'title': args[0].get('title')}
+            else:
+                payload = {'id': index, 'message': args[0]}
+            self._broadcast(event, payload)
+        return listener
+
+    def _broadcast(self, event, payload):
+        with self._clients_lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.put_nowait((event, payload))
+            except queue.Full:
+                # медленный клиент теряет промежуточные события, но не тормозит движок
+                pass
+
+    def subscribe(self):
+        client = queue.Queue(SSE_BACKLOG)
+        with self._clients_lock:
+            self._clients.append(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self._clients_lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    # операции ниже выполняются в потоке движка через invoke
+    def list_jobs(self):
+        return [job_view(item) for item in self.engine.jobs]
+
+    def get_job(self, job_id):
+        item = self.engine.jobs.get(job_id)
+        if item is None:
+            raise ApiError(404, f"Задача {job_id} не найдена")
+        return job_view(item)
+
+    def add_jobs(self, urls, start=True, playlist=False, mode='video', outtmpl=None):
+        created, playlists = [], []
+        for url in urls:
+            if playlist:
+                playlists.append(self.engine.expand_playlist(url, mode, outtmpl))
+                continue
+            is_new, job_id = self.engine.add_video(url, mode, outtmpl)
+            if start:
+                self.engine.start_download(job_id)
+            created.append({'id': job_id, 'created': bool(is_new)})
+        return {'jobs': created, 'playlists': playlists}
+
+    def start_job(self, job_id):
+        self.get_job(job_id)
+        self.engine.start_download(job_id)
+        return job_view(self.engine.jobs[job_id])
+
+    def cancel_job(self, job_id):
+        self.get_job(job_id)
+        self.engine.stop_download(job_id)
+        return job_view(self.engine.jobs[job_id])
+
+    def remove_job(self, job_id):
+        self.get_job(job_id)
+        self.engine.remove_video(job_id)
+        return {'id': job_id, 'removed': True}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    api = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self._route('GET')
+
+    def do_POST(self):
+        self._route('POST')
+
+    def do_DELETE(self):
+        self._route('DELETE')
+
+    def _route(self, method):
+        parts = [p for p in self.path.split('?')[0].split('/') if p]
+        try:
+            self._check_origin()
+            if parts == ['events'] and method == 'GET':
+                return self._stream_events()
+            if not parts or parts[0] != 'jobs':
+                raise ApiError(404, "Неизвестный адрес")
+            if len(parts) == 1:
+                if method == 'GET':
+                    return self._reply(200, {'jobs': self.api.invoke(self.api.list_jobs)})
+                if method == 'POST':
+                    body = self._read_json()
+                    urls = body.get('urls') or ([body['url']] if body.get('url') else [])
+                    if not isinstance(urls, list) or not all(isinstance(u, str) for u in urls) or not urls:
+                        raise ApiError(400, "Ожидается непустой список строк 'urls'")
+                    mode = body.get('mode', 'video')
+                    if mode not in ('video', 'audio'):
+                        raise ApiError(400, "mode должен быть 'video' или 'audio'")
+                    start, playlist = body.get('start', True), body.get('playlist', False)
+                    if not isinstance(start, bool) or not isinstance(playlist, bool):
+                        # строка "false" иначе превратилась бы в True
+                        raise ApiError(400, "start и playlist должны быть true или false")
+                    result = self.api.invoke(self.api.add_jobs, urls, start, playlist, mode,
+                                             check_outtmpl(body.get('outtmpl')))
+                    return self._reply(201, result)
+                raise ApiError(405, "Метод не поддерживается")
+            try:
+                job_id = int(parts[1])
+            except ValueError:
+                raise ApiError(404, "Некорректный номер задачи")
+            action = parts[2] if len(parts) > 2 else None
+            if len(parts) > 3:
+                raise ApiError(404, "Неизвестный адрес")
+            if action is None and method == 'GET':
+                return self._reply(200, self.api.invoke(self.api.get_job, job_id))
+            if action is None and method == 'DELETE':
+                return self._reply(200, self.api.invoke(self.api.remove_job, job_id))
+            if action == 'cancel' and method == 'POST':
+                return self._reply(200, self.api.invoke(self.api.cancel_job, job_id))
+            if action == 'start' and method == 'POST':
+                return self._reply(200, self.api.invoke(self.api.start_job, job_id))
+            raise ApiError(404 if action not in (None, 'cancel', 'start') else 405, "Неизвестное действие")
+        except ApiError as e:
+            # тело отклонённого запроса могло остаться непрочитанным
+            self.close_connection = True
+            self._reply(e.status, {'error': str(e)})
+        except TimeoutError:
+            self._reply(503, {'error': "Движок не отвечает"})
+        except Exception as e:
+            logger.exception("Ошибка обработки запроса %s %s", method, self.path)
+            self._reply(500, {'error': str(e)})
+
+    def _is_local(self, netloc):
+        try:
+            parsed = urlsplit(f"//{netloc}")
+            port = parsed.port
+        except ValueError:
+            return False
+        return parsed.hostname in LOCAL_HOSTS and port in (None, self.server.server_address[1])
+
+    def _check_origin(self):
+        if not self._is_local(self.headers.get('Host', '')):
+            raise ApiError(403, "Недопустимый заголовок Host")
+        origin = self.headers.get('Origin')
+        if origin is not None and not (origin.startswith('http://') and self._is_local(origin[len('http://'):])):
+            raise ApiError(403, "Запросы с чужих страниц запрещены")
+
+    def _read_json(self):
+        # простые формы и text/plain браузер шлёт без предварительного запроса, поэтому только JSON
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            raise ApiError(415, "Ожидается Content-Type: application/json")
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length).decode('utf-8'))
+        except (ValueError, UnicodeDecodeError):
+            raise ApiError(400, "Тело запроса должно быть JSON")
+        if isinstance(body, list):
+            body = {'urls': body}
+        if not isinstance(body, dict):
+            raise ApiError(400, "Тело запроса должно быть JSON-объектом")
+        return body
+
+    def _reply(self, status, data):
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        client = self.api.subscribe()
+        try:
+            # первым сообщением - текущий снимок очереди, дальше только изменения
+            snapshot = self.api.invoke(self.api.list_jobs)
+            self._send_event('snapshot', {'jobs': snapshot})
+            while True:
+                try:
+                    message = client.get(timeout=SSE_KEEPALIVE)
+                except queue.Empty:
+                    self.wfile.write(b': keepalive\n\n')
+                    self.wfile.flush()
+                    continue
+                if message is None:
+                    return
+                self._send_event(*message)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.api.unsubscribe(client)
+
+    def _send_event(self, event, data):
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8'))
+        self.wfile.flush()
@@ -0,0 +1,69 @@
+import json
+import os
+
+STATE_FILE = "jobs.json"
+SETTINGS_FILE = "settings.json"
+
+# только то, что нужно для продолжения; сведения о видео (со списком форматов) берутся из MetadataCache
+PERSIST_FIELDS = ('url', 'title', 'status', '_filename', '_filepath', '_out_dir', '_proxy',
+                  'rate_limit', 'profile', 'mode', 'outtmpl', 'audio_codec')
+# прерванная постобработка повторяется: скачанный файл yt-dlp пропустит
+RESUMABLE = ('waiting', 'downloading', 'paused', 'error', 'postprocessing')
+
+
+def atomic_write_json(path, data, **kwargs):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, **kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class JobStore:
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except Exception:
+            return []
+        return [r for r in records if isinstance(r, dict) and r.get('url')]
+
+    def save(self, jobs):
+        records = []
+        for item in jobs:
+            if item.get('status') == 'done':
+                continue
+            records.append({k: item[k] for k in PERSIST_FIELDS if item.get(k) is not None})
+        atomic_write_json(self.path, records)
+
+
+class SettingsStore:
+    def __init__(self, path=SETTINGS_FILE):
+        self.path = path
+        self._written = None
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        self._written = json.dumps(data, indent=4, ensure_ascii=False)
+        return data
+
+    def save(self, settings):
+        # тот же текст, что уже на диске, повторно не пишем
+        text = json.dumps(settings, indent=4, ensure_ascii=False)
+        if text == self._written:
+            return False
+        atomic_write_json(self.path, settings, indent=4)
+        self._written = text
+        return True
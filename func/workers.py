@@ -0,0 +1,240 @@
+import copy
+import json
+import os
+import time
+
+from func.formats import summarize_formats
+
+PROGRESS_RATE = 5
+PLAYLIST_BATCH = 20
+DEFAULT_FORMAT = 'bestvideo+bestaudio/best'
+
+# состояние прогресса в компактном кортеже (state, downloaded, total, speed, eta, filename)
+PROGRESS_DOWNLOADING = 0
+PROGRESS_FINISHED = 1
+PROGRESS_ERROR = 2
+
+_PROGRESS_STATES = {
+    'downloading': PROGRESS_DOWNLOADING,
+    'finished': PROGRESS_FINISHED,
+    'error': PROGRESS_ERROR,
+}
+
+
+def _filesize(info):
+    formats = info.get('requested_formats') or [info]
+    sizes = [f.get('filesize') or f.get('filesize_approx') for f in formats]
+    if not all(sizes):
+        return None
+    return int(sum(sizes))
+
+
+def summarize_info(info, info_json=None):
+    # в главный процесс уходит только это, а не весь словарь extract_info
+    return {
+        'id': info.get('id'),
+        'title': info.get('title') or 'Без названия',
+        'ext': info.get('ext'),
+        'duration': info.get('duration'),
+        'filesize': _filesize(info),
+        'format_id': info.get('format_id'),
+        'thumbnail': info.get('thumbnail'),
+        'webpage_url': info.get('webpage_url'),
+        'extractor': info.get('extractor_key') or info.get('extractor'),
+        'info_json': info_json,
+        'formats': summarize_formats(info),
+    }
+
+
+def _info_worker(index, url, q, proxy=None, json_dir=None):
+    try:
+        import yt_dlp
+        ydl_opts = {'quiet': True, 'no_warnings': True, 'noplaylist': True,
+                    'format': DEFAULT_FORMAT}
+        if proxy:
+            ydl_opts['proxy'] = proxy
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+            info_json = None
+            if json_dir:
+                os.makedirs(json_dir, exist_ok=True)
+                info_json = os.path.join(json_dir, f"{info.get('extractor_key', 'video')}_{info.get('id')}.info.json")
+                with open(info_json, 'w', encoding='utf-8') as f:
+                    json.dump(ydl.sanitize_info(info), f, ensure_ascii=False)
+        q.put(('info_ok', index, {'info': summarize_info(info, info_json)}))
+    except Exception as e:
+        q.put(('info_err', index, {'message': str(e)}))
+
+
+def _iter_flat_entries(entries):
+    for entry in entries or ():
+        if not entry:
+            continue
+        if entry.get('_type') == 'playlist':
+            yield from _iter_flat_entries(entry.get('entries'))
+            continue
+        url = entry.get('webpage_url') or entry.get('url')
+        if url:
+            yield url, entry.get('title')
+
+
+def _playlist_worker(index, url, q, proxy=None, cancel=None, batch_size=PLAYLIST_BATCH):
+    try:
+        import yt_dlp
+        from yt_dlp.utils import DownloadCancelled
+        ydl_opts = {'quiet': True, 'no_warnings': True, 'extract_flat': 'in_playlist', 'lazy_playlist': True}
+        if proxy:
+            ydl_opts['proxy'] = proxy
+        count = 0
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            # process=False отдаёт entries генератором, поэтому записи приходят по мере листания
+            info = ydl.extract_info(url, download=False, process=False)
+            for _ in range(3):
+                if info.get('_type') not in ('url', 'url_transparent'):
+                    break
+                info = ydl.extract_info(info['url'], download=False, process=False)
+            if info.get('_type') != 'playlist':
+                entries = [{'url': url, 'title': info.get('title')}]
+            else:
+                entries = info.get('entries')
+            batch = []
+            for entry in _iter_flat_entries(entries):
+                if cancel is not None and cancel.value == index:
+                    raise DownloadCancelled('Остановлено пользователем')
+                batch.append(entry)
+                count += 1
+                if len(batch) >= batch_size:
+                    q.put(('entries', index, batch))
+                    batch = []
+            if batch:
+                q.put(('entries', index, batch))
+        q.put(('playlist_done', index, {'ok': True, 'count': count, 'title': info.get('title')}))
+    except Exception as e:
+        q.put(('playlist_done', index, {'ok': False, 'message': str(e)}))
+
+
+def _download_ranged(ydl, info, connections, hook, throttle=None):
+    from func.ranged import RangesNotSupported, download_ranges, ranged_format
+    if ranged_format(info):
+        path = ydl.prepare_filename(info)
+        if not os.path.exists(path):
+            try:
+                download_ranges(ydl, info['url'], path, connections, info.get('http_headers'), hook,
+                                throttle=throttle)
+            except RangesNotSupported:
+                pass
+    # готовый файл yt-dlp пропустит и только выполнит постобработку
+    return ydl.process_ie_result(info, download=True)
+
+
+def _strip_ext(template):
+    if template.endswith('.%(ext)s'):
+        return template[:-len('.%(ext)s')]
+    return os.path.splitext(template)[0]
+
+
+def _download_streams(ydl_opts, url, streams, merge_format, connections, hook, throttle, q, index):
+    # дорожки качаются по отдельности, сведение делает пул постобработки, а не сетевой воркер
+    import yt_dlp
+    base = _strip_ext(ydl_opts['outtmpl'])
+    with yt_dlp.YoutubeDL(dict(ydl_opts, outtmpl=base + '.%(ext)s')) as ydl:
+        raw = ydl.extract_info(url, download=False, process=False)
+        available = {f.get('format_id') for f in raw.get('formats') or ()}
+        if raw.get('_type', 'video') != 'video' or not set(streams) <= available:
+            # формат из кэша устарел - пусть yt-dlp выберет сам и сведёт как обычно
+            return None
+        output = ydl.prepare_filename(dict(raw, ext=merge_format or 'mkv'))
+    formats = []
+    for n, format_id in enumerate(streams, 1):
+        q.put(('status', index, {'text': f"Дорожка {n} из {len(streams)}"}))
+        opts = dict(ydl_opts, format=format_id, outtmpl=base + '.f%(format_id)s.%(ext)s')
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = copy.deepcopy(raw)
+            if connections > 1:
+                info = _download_ranged(ydl, ydl.process_ie_result(info, download=False), connections, hook,
+                                        throttle)
+            else:
+                info = ydl.process_ie_result(info, download=True)
+        formats.append({
+            'filepath': info['requested_downloads'][0]['filepath'],
+            'format_id': format_id,
+            'vcodec': info.get('vcodec'),
+            'acodec': info.get('acodec'),
+            'protocol': info.get('protocol'),
+        })
+    return {'output': output, 'formats': formats}
+
+
+def _download_worker(index, url, out_dir, proxy, q, filename, cancel=None, progress_rate=PROGRESS_RATE,
+                     fragments=1, connections=1, throttle=None, format_spec=None, merge_format=None,
+                     streams=None):
+    try:
+        import yt_dlp
+        from yt_dlp.utils import DownloadCancelled
+
+        min_interval = 1.0 / progress_rate if progress_rate else 0.0
+        last_sent = [0.0]
+        last_bytes = [None, None]
+
+        def hook(d):
+            if cancel is not None and cancel.value == index:
+                raise DownloadCancelled('Остановлено пользователем')
+            if throttle is not None and not d.get('throttled'):
+                # hook вызывается после каждого блока, поэтому сон здесь притормаживает саму загрузку
+                # счётчик байт свой у каждого файла: вторая дорожка начинает с нуля
+                done = d.get('downloaded_bytes') or 0
+                if last_bytes[1] != d.get('filename'):
+                    last_bytes[:] = [None, d.get('filename')]
+                if last_bytes[0] is not None and done > last_bytes[0]:
+                    throttle(done - last_bytes[0])
+                last_bytes[0] = None if d.get('status') == 'finished' else done
+            state = _PROGRESS_STATES.get(d.get('status'))
+            if state is None:
+                return
+            if state == PROGRESS_FINISHED and not d.get('throttled') and d.get('filename'):
+                from func.ranged import remove_partial
+                remove_partial(d['filename'])
+            now = time.monotonic()
+            # промежуточный прогресс прореживаем, переходы состояний отправляем всегда
+            if state == PROGRESS_DOWNLOADING and now - last_sent[0] < min_interval:
+                return
+            last_sent[0] = now
+            q.put(('progress', index, (
+                state,
+                d.get('downloaded_bytes') or 0,
+                d.get('total_bytes') or d.get('total_bytes_estimate') or 0,
+                d.get('speed'),
+                d.get('eta'),
+                d.get('filename') if state != PROGRESS_DOWNLOADING else None,
+            )))
+
+        ydl_opts = {
+            'outtmpl': os.path.join(out_dir, filename or '%(title)s.%(ext)s'),
+            'format': format_spec or DEFAULT_FORMAT,
+            'noplaylist': True,
+            'continuedl': True,
+            'concurrent_fragment_downloads': max(1, int(fragments)),
+            'progress_hooks': [hook],
+            'quiet': True,
+            'noprogress': True,
+            'no_warnings': False,
+        }
+        if merge_format:
+            ydl_opts['merge_output_format'] = merge_format
+        if proxy:
+            print(proxy)
+            ydl_opts['proxy'] = proxy
+        q.put(('status', index, {'text': 'Начало загрузки'}))
+        if streams and len(streams) > 1:
+            merge = _download_streams(ydl_opts, url, streams, merge_format, connections, hook, throttle, q, index)
+            if merge is not None:
+                q.put(('done', index, {'ok': True, 'message': 'Дорожки скачаны', 'merge': merge}))
+                return
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            if connections > 1:
+                _download_ranged(ydl, ydl.extract_info(url, download=False), connections, hook, throttle)
+            else:
+                ydl.download([url])
+        q.put(('done', index, {'ok': True, 'message': 'Загрузка завершена'}))
+    except Exception as e:
+        q.put(('done', index, {'ok': False, 'message': str(e)}))
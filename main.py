@@ -1,3 +1,5 @@
+# первым импортом: модуль засекает время запуска процесса для отчёта о старте
+import ui.startup  # noqa: F401
 import logging
 import os
 import sys
@@ -6,14 +8,12 @@ from datetime import datetime
 
 from PyQt6.QtCore import QByteArray, Qt
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QPixmap, QIcon
 
 
 
 print(__name__)
 if __name__ == '__main__':
     from ui.MainWindow import MainWindow
-    from func import resources
 
 
     class ErrorOnlyFileHandler(logging.FileHandler):
@@ -62,12 +62,15 @@ if __name__ == '__main__':
 
     # sys.excepthook = log_exception
 
+    def load_icon():
+        from func import resources
+        app.setWindowIcon(resources.icon("app.ico"))
+
     app = QApplication([])
-    icon = QPixmap()
-    icon.loadFromData(bytes(resources.bin), format='ico')
-    app.setWindowIcon(QIcon(icon))
 
     win = MainWindow()
+    # иконка не нужна для первой отрисовки, её разбор идёт последним этапом запуска
+    win.add_startup_stage("Иконка", load_icon)
     win.showNormal()
 
     app.exec()
\ No newline at end of file
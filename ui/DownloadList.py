@@ -0,0 +1,275 @@
+import time
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtWidgets import (
+    QStyledItemDelegate, QStyle, QStyleOptionButton, QStyleOptionProgressBar, QApplication, QToolTip,
+    QListView, QAbstractItemView
+)
+
+JOB_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# порядок кнопок в строке: действие, подпись по умолчанию, подсказка
+BUTTONS = (
+    ('refresh', "Обновить", "Заново получить информацию, минуя кэш"),
+    ('start', "Скачать", None),
+    ('stop', "Пауза", None),
+    ('show', "Показать в папке", None),
+    ('remove', "Удалить", None),
+)
+
+_LABELS = {action: text for action, text, _ in BUTTONS}
+_TIPS = {action: tip for action, _, tip in BUTTONS if tip}
+
+FLASH_TIME = 1.0
+FLASH_STEP = 40
+MARGIN = 6
+SPACING = 4
+BUTTON_HEIGHT = 26
+PROGRESS_HEIGHT = 18
+
+
+def _row_state(index, title, url):
+    return {
+        'index': index,
+        'title': title,
+        'url': url,
+        'format': "",
+        'progress': 0,
+        'status': "В очереди",
+        'start_text': "Скачать",
+        'enabled': {'refresh': True, 'start': False, 'stop': False, 'show': False, 'remove': True},
+    }
+
+
+class JobModel(QAbstractListModel):
+    # строка хранит только то, что рисует делегат; виджетов на задачу нет
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._states = []
+        self._rows = {}
+        self._flash = {}
+        self._flash_timer = QTimer(self)
+        self._flash_timer.setInterval(FLASH_STEP)
+        self._flash_timer.timeout.connect(self._tick_flash)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._states)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        state = self._states[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return state['title']
+        if role == JOB_ROLE:
+            return state
+        return None
+
+    def __contains__(self, job_id):
+        return job_id in self._rows
+
+    def ids(self):
+        return [state['index'] for state in self._states]
+
+    def state(self, job_id):
+        return self._states[self._rows[job_id]]
+
+    def add_jobs(self, jobs):
+        # пачка строк вставляется одним beginInsertRows, так плейлист на тысячи записей не дёргает вид
+        jobs = [job for job in jobs if job[0] not in self._rows]
+        if not jobs:
+            return
+        first = len(self._states)
+        self.beginInsertRows(QModelIndex(), first, first + len(jobs) - 1)
+        for job_id, title, url in jobs:
+            self._rows[job_id] = len(self._states)
+            self._states.append(_row_state(job_id, title, url))
+        self.endInsertRows()
+
+    def add_job(self, job_id, title, url):
+        self.add_jobs([(job_id, title, url)])
+        return self._states[self._rows[job_id]]
+
+    def remove_job(self, job_id):
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return
+        self._flash.pop(job_id, None)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._states[row]
+        for state in self._states[row:]:
+            self._rows[state['index']] -= 1
+        self.endRemoveRows()
+
+    def update(self, job_id, enabled=None, **fields):
+        row = self._rows.get(job_id)
+        if row is None:
+            return
+        state = self._states[row]
+        state.update(fields)
+        if enabled:
+            state['enabled'].update(enabled)
+        # перерисовывается только эта строка
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [JOB_ROLE])
+
+    def flash(self, job_id):
+        if job_id not in self._rows:
+            return
+        self._flash[job_id] = time.monotonic()
+        if not self._flash_timer.isActive():
+            self._flash_timer.start()
+
+    def flash_level(self, job_id):
+        started = self._flash.get(job_id)
+        if started is None:
+            return 0.0
+        return max(0.0, 1.0 - (time.monotonic() - started) / FLASH_TIME)
+
+    def _tick_flash(self):
+        for job_id in list(self._flash):
+            if not self.flash_level(job_id):
+                del self._flash[job_id]
+            row = self._rows.get(job_id)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [JOB_ROLE])
+        if not self._flash:
+            self._flash_timer.stop()
+
+
+class JobDelegate(QStyledItemDelegate):
+    action_triggered = pyqtSignal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed = None
+
+    def _lines(self, option):
+        return option.fontMetrics.height()
+
+    def sizeHint(self, option, index):
+        line = self._lines(option)
+        height = MARGIN * 2 + line * 4 + PROGRESS_HEIGHT + BUTTON_HEIGHT + SPACING * 5
+        return QSize(480, height)
+
+    def _button_rects(self, option):
+        rect = option.rect.adjusted(MARGIN, MARGIN, -MARGIN, -MARGIN)
+        metrics = option.fontMetrics
+        top = rect.bottom() - BUTTON_HEIGHT + 1
+        right = rect.right() + 1
+        rects = []
+        for action, text, _ in reversed(BUTTONS):
+            # под «Скачать» сразу место для «Продолжить», чтобы кнопки не прыгали
+            width = 80 if action == 'remove' else metrics.horizontalAdvance(
+                "Продолжить" if action == 'start' else text) + 24
+            rects.append((action, QRect(right - width, top, width, BUTTON_HEIGHT)))
+            right -= width + SPACING
+        rects.reverse()
+        return rects
+
+    def _button_at(self, option, pos):
+        for action, rect in self._button_rects(option):
+            if rect.contains(pos):
+                return action
+        return None
+
+    def paint(self, painter, option, index):
+        state = index.data(JOB_ROLE)
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        painter.save()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, widget)
+        level = index.model().flash_level(state['index'])
+        if level:
+            painter.fillRect(option.rect, QColor(255, 255, 0, int(150 * level)))
+        painter.setPen(QColor(200, 200, 200))
+        painter.drawLine(option.rect.bottomLeft(), option.rect.bottomRight())
+
+        rect = option.rect.adjusted(MARGIN, MARGIN, -MARGIN, -MARGIN)
+        line = self._lines(option)
+        metrics = option.fontMetrics
+        y = rect.top()
+        bold = QFont(option.font)
+        bold.setBold(True)
+        painter.setFont(bold)
+        painter.setPen(option.palette.color(option.palette.ColorRole.Text))
+        painter.drawText(QRect(rect.left(), y, rect.width(), line), Qt.AlignmentFlag.AlignLeft,
+                         metrics.elidedText(state['title'], Qt.TextElideMode.ElideRight, rect.width()))
+        painter.setFont(option.font)
+        y += line + SPACING
+        painter.drawText(QRect(rect.left(), y, rect.width(), line), Qt.AlignmentFlag.AlignLeft,
+                         metrics.elidedText(state['url'], Qt.TextElideMode.ElideMiddle, rect.width()))
+        y += line + SPACING
+        painter.setPen(QColor("grey"))
+        painter.drawText(QRect(rect.left(), y, rect.width(), line), Qt.AlignmentFlag.AlignLeft, state['format'])
+        y += line + SPACING
+
+        bar = QStyleOptionProgressBar()
+        bar.rect = QRect(rect.left(), y, rect.width(), PROGRESS_HEIGHT)
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = int(state['progress'])
+        bar.text = f"{bar.progress}%"
+        bar.textVisible = True
+        bar.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Horizontal
+        style.drawControl(QStyle.ControlElement.CE_ProgressBar, bar, painter, widget)
+        y += PROGRESS_HEIGHT + SPACING
+
+        painter.setPen(option.palette.color(option.palette.ColorRole.Text))
+        painter.drawText(QRect(rect.left(), y, rect.width(), line), Qt.AlignmentFlag.AlignLeft,
+                         metrics.elidedText(state['status'], Qt.TextElideMode.ElideRight, rect.width()))
+
+        for action, button_rect in self._button_rects(option):
+            button = QStyleOptionButton()
+            button.rect = button_rect
+            button.text = state['start_text'] if action == 'start' else _LABELS[action]
+            button.state = QStyle.StateFlag.State_Raised
+            if state['enabled'][action]:
+                button.state |= QStyle.StateFlag.State_Enabled
+                if self._pressed == (state['index'], action):
+                    button.state |= QStyle.StateFlag.State_Sunken
+            button.palette = option.palette
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        # кнопки нарисованы, поэтому нажатия разбираем сами
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+                                QEvent.Type.MouseButtonDblClick):
+            return False
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+        state = index.data(JOB_ROLE)
+        action = self._button_at(option, event.position().toPoint())
+        if action is None or not state['enabled'][action]:
+            self._pressed = None
+            return False
+        key = (state['index'], action)
+        if event.type() == QEvent.Type.MouseButtonRelease:
+            pressed, self._pressed = self._pressed, None
+            model.dataChanged.emit(index, index, [JOB_ROLE])
+            if pressed == key:
+                self.action_triggered.emit(*key)
+            return True
+        self._pressed = key
+        model.dataChanged.emit(index, index, [JOB_ROLE])
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.Type.ToolTip:
+            action = self._button_at(option, event.pos())
+            if action in _TIPS:
+                QToolTip.showText(event.globalPos(), _TIPS[action], view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+
+class JobListView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # одинаковая высота строк: вид не опрашивает sizeHint у каждой из тысяч записей
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
@@ -0,0 +1,7 @@
+import sys
+
+# win32api/ctypes и настройка DWM подгружаются только на Windows, на остальных системах окно на чистом Qt
+if sys.platform == "win32":
+    from ui.WindowsAbstractWindow import WindowsFramelessWindow as FramelessWindow
+else:
+    from ui.QtFramelessWindow import QtFramelessWindow as FramelessWindow
@@ -1,19 +1,22 @@
+import logging
 import os
-import json
 
-from PyQt6 import QtCore
-from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
-    QProgressBar, QListWidget, QListWidgetItem, QFileDialog,
+    QListWidget, QFileDialog,
     QMessageBox, QSizePolicy, QFrame, QSpacerItem, QRadioButton,
-    QButtonGroup, QSpinBox, QGroupBox, QTextEdit
+    QButtonGroup, QSpinBox, QGroupBox, QTextEdit, QCheckBox, QComboBox
 )
 from ui.windowAbs import WindowAbs
-from func.loader import DownloadManager
+from func.formats import PROFILES
+from func.state import STATE_FILE, SETTINGS_FILE, SettingsStore
+from ui.DownloadList import JobModel, JobDelegate, JobListView
+from ui.startup import StartupReport
 
-SETTINGS_FILE = "settings.json"
-HISTORY_FILE = "history.json"
+logger = logging.getLogger(__name__)
+
+SETTINGS_SAVE_DELAY = 500
+STARTUP_FALLBACK = 300
 
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, pyqtProperty, QTimer
 
@@ -99,169 +102,11 @@ class ExpandableSide(QWidget):
         else:
             self.expand()
 
-class DownloadCard(QWidget):
-    def __init__(self, index, title, url, manager: DownloadManager, remove_callback, main_window):
-        super().__init__()
-        self.index = index
-        self.manager = manager
-        self.url = url
-        self.remove_callback = remove_callback
-        self.main_window = main_window
-        self.animation = None
-        self.original_style = self.styleSheet()
-
-        self.title_label = QLabel(title)
-        self.title_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-
-        self.url_label = QLabel(url)
-        self.url_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setValue(0)
-
-        self.status_label = QLabel("В очереди")
-
-        self.btn_start = QPushButton("Скачать")
-        self.btn_start.setEnabled(False)
-
-        self.btn_stop = QPushButton("Остановить")
-        self.btn_stop.setEnabled(False)
-
-        self.btn_show = QPushButton("Показать в папке")
-        self.btn_show.setEnabled(False)
-
-        self.btn_remove = QPushButton("Удалить")
-        self.btn_remove.setFixedWidth(80)
-        self.btn_remove.setEnabled(True)
-
-        h = QHBoxLayout()
-        h.addWidget(self.btn_start)
-        h.addWidget(self.btn_stop)
-        h.addWidget(self.btn_show)
-        h.addWidget(self.btn_remove)
-
-        layout = QVBoxLayout()
-        layout.addWidget(self.title_label)
-        layout.addWidget(self.url_label)
-        layout.addWidget(self.progress_bar)
-        layout.addWidget(self.status_label)
-        layout.addLayout(h)
-        self.setLayout(layout)
-
-        self.btn_start.clicked.connect(self.on_start)
-        self.btn_stop.clicked.connect(self.on_stop)
-        self.btn_remove.clicked.connect(self.on_remove)
-        self.btn_show.clicked.connect(self.show_in_folder)
-        manager.progress_changed.connect(self.on_progress)
-        manager.status_changed.connect(self.on_status)
-        manager.info_received.connect(self.on_info)
-
-    def on_start(self):
-        self.manager.out_dir = self.main_window.out_dir_edit_right.text().strip() or "."
-        proxy_str = self.main_window._get_proxy_str(self.url)
-        self.manager.proxy = proxy_str
-        self.manager.start_download(self.index)
-        self.btn_start.setEnabled(False)
-        self.btn_stop.setEnabled(True)
-        self.btn_show.setEnabled(False)
-        self.btn_remove.setEnabled(False)
-        self.status_label.setText("Запуск...")
-
-    def on_stop(self):
-        self.manager.stop_download(self.index)
-        self.btn_stop.setEnabled(False)
-        self.btn_show.setEnabled(True)
-        self.btn_remove.setEnabled(True)
-        self.btn_start.setEnabled(True)
-        self.status_label.setText("Остановка...")
-
-    def on_remove(self):
-        self.remove_callback(self.index)
-
-    def on_progress(self, idx, percent):
-        if idx != self.index:
-            return
-        self.progress_bar.setValue(int(percent))
-
-    def on_status(self, idx, status):
-        if idx != self.index:
-            return
-        self.status_label.setText(status)
-        lowered = status.lower() if status else ""
-        finished_keywords = ("заверш", "файл готов", "ошибк")
-        if any(k in lowered for k in finished_keywords):
-            self.btn_start.setEnabled(False)
-            self.btn_stop.setEnabled(False)
-            self.btn_remove.setEnabled(True)
-            self.btn_show.setEnabled(True)
-
-    def on_info(self, idx, info):
-        if idx != self.index:
-            return
-        title = info.get('title', 'Без названия')
-        self.title_label.setText(title)
-
-        out_dir = self.main_window.out_dir_edit_right.text().strip() or "."
-        ext = info.get('ext', 'mp4')
-        filename = f"{title}.{ext}"
-        self.manager.queue[self.index]["_filename"] = filename
-        filepath = os.path.join(out_dir, filename)
-        print(title, ext, filepath)
-        if os.path.exists(filepath):
-            self.btn_start.setEnabled(False)
-            self.btn_show.setEnabled(True)
-        else:
-            self.btn_start.setEnabled(True)
-            self.btn_show.setEnabled(False)
-
-        self.manager.queue[self.index]["_filepath"] = filepath
-
-    def show_in_folder(self):
-        filepath = self.manager.queue[self.index].get("_filepath").replace("/", "\\")
-        if os.path.exists(filepath):
-            path = f"explorer /select, \"{filepath}\""
-            print(path)
-            os.system(path)
-        else:
-            QMessageBox.warning(self, "Ошибка", "Файл не найден, возможно вы его уже удалили!")
-            out_dir = self.main_window.out_dir_edit_right.text().strip() or "."
-            os.system("start "+out_dir)
-
-    def highlight_card(self):
-        if self.animation and self.animation.state() == QPropertyAnimation.State.Running:
-            self.animation.stop()
-
-        self.animation = QPropertyAnimation(self, b"background_color")
-        self.animation.setDuration(1000)
-        self.animation.setStartValue(QColor(255, 255, 0, 150))
-        self.animation.setEndValue(QColor(255, 255, 255, 0))
-        self.animation.start()
-
-        QTimer.singleShot(1100, self.reset_style)
-
-    def get_background_color(self):
-        return self.palette().color(self.backgroundRole())
-
-    def set_background_color(self, color):
-        palette = self.palette()
-        palette.setColor(self.backgroundRole(), color)
-        self.setAutoFillBackground(True)
-        self.setPalette(palette)
-
-    def reset_style(self):
-        self.setAutoFillBackground(False)
-        self.setStyleSheet(self.original_style)
-
-    background_color = QtCore.pyqtProperty(QColor, get_background_color, set_background_color)
-
 class MainWindow(WindowAbs):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("PyTubeLoader")
         self.resize(1060, 700)
-        self.manager = DownloadManager()
-        self.cards = {}
-        self.history = []
         self.settings = {"out_dir": os.path.join(os.getcwd(), "downloads"),
                          "proxy_mode": "none",
                          "proxy_port": 1080,
@@ -269,9 +114,34 @@ class MainWindow(WindowAbs):
                          "history_limit": 50,
                          "proxy_list_mode": "none",
                          "proxy_whitelist": "",
-                         "proxy_blacklist": ""}
+                         "proxy_blacklist": "",
+                         "pool_size": 4,
+                         "max_downloads": 4,
+                         "host_limits": {"youtube.com": 3, "vk.com": 2},
+                         "progress_rate": 5,
+                         "cache_ttl_hours": 168,
+                         "cache_max_entries": 5000,
+                         "api_port": 0,
+                         "executor": "process",
+                         "info_timeout": 120,
+                         "stall_timeout": 600,
+                         "concurrent_fragments": 4,
+                         "connections": 4,
+                         "bandwidth_limit_kbps": 0,
+                         "job_limit_kbps": 0,
+                         "bandwidth_schedule": [],
+                         "format_profile": "best",
+                         "format_profiles": {},
+                         "audio_codec": "best",
+                         "audio_template": "",
+                         "video_template": ""}
+        self.settings_store = SettingsStore(SETTINGS_FILE)
+        # изменения копятся и пишутся одним разом после паузы во вводе
+        self.settings_timer = QTimer(self)
+        self.settings_timer.setSingleShot(True)
+        self.settings_timer.setInterval(SETTINGS_SAVE_DELAY)
+        self.settings_timer.timeout.connect(self.flush_settings)
         self.load_settings()
-        self.load_history()
         main_layout = QHBoxLayout()
         container = QWidget()
         container.setLayout(main_layout)
@@ -280,9 +150,6 @@ class MainWindow(WindowAbs):
         except Exception:
             self.setLayout(main_layout)
         self.left_panel = ExpandableSide("История", min_w=0, max_w=320, side="left")
-        self.history_list = QListWidget()
-        self.history_list.setMinimumWidth(220)
-        self.left_panel.addWidget(self.history_list)
         main_layout.addWidget(self.left_panel)
         center_widget = QWidget()
         center_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -302,24 +169,112 @@ class MainWindow(WindowAbs):
         center_layout.addLayout(toggles_layout)
         add_layout = QHBoxLayout()
         self.url_edit = QLineEdit()
-        add_btn = QPushButton("Добавить в очередь")
-        add_btn.clicked.connect(self.add_video)
+        self.add_btn = QPushButton("Добавить в очередь")
+        self.add_btn.clicked.connect(self.add_video)
+        self.playlist_cb = QCheckBox("Плейлист / канал")
         add_layout.addWidget(self.url_edit)
-        add_layout.addWidget(add_btn)
+        add_layout.addWidget(self.playlist_cb)
+        self.audio_cb = QCheckBox("Только звук")
+        add_layout.addWidget(self.audio_cb)
+        add_layout.addWidget(self.add_btn)
         center_layout.addLayout(add_layout)
-        self.list_widget = QListWidget()
-        self.list_widget.setMinimumWidth(480)
-        center_layout.addWidget(self.list_widget)
+        self.jobs_model = JobModel(self)
+        self.job_list = JobListView()
+        self.job_list.setMinimumWidth(480)
+        self.job_list.setModel(self.jobs_model)
+        self.jobs_delegate = JobDelegate(self.job_list)
+        self.jobs_delegate.action_triggered.connect(self._on_job_action)
+        self.job_list.setItemDelegate(self.jobs_delegate)
+        center_layout.addWidget(self.job_list)
         control_layout = QHBoxLayout()
-        btn_start_all = QPushButton("Скачать все")
-        btn_stop_all = QPushButton("Остановить все")
-        btn_start_all.clicked.connect(self.start_all)
-        btn_stop_all.clicked.connect(self.stop_all)
-        control_layout.addWidget(btn_start_all)
-        control_layout.addWidget(btn_stop_all)
+        self.btn_start_all = QPushButton("Скачать все")
+        self.btn_stop_all = QPushButton("Остановить все")
+        self.btn_start_all.clicked.connect(self.start_all)
+        self.btn_stop_all.clicked.connect(self.stop_all)
+        control_layout.addWidget(self.btn_start_all)
+        control_layout.addWidget(self.btn_stop_all)
         center_layout.addLayout(control_layout)
         main_layout.addWidget(center_widget, stretch=1)
         self.right_panel = ExpandableSide("Настройки", min_w=0, max_w=500, side="right")
+        main_layout.addWidget(self.right_panel)
+        self.manager = None
+        self.history = None
+        self.api_server = None
+        # до первой отрисовки строится только центральная часть, остальное - этапами уже в цикле событий
+        self.startup = StartupReport()
+        self.startup.mark("Главное окно")
+        self._startup_stages = [
+            ("Менеджер загрузок", self._init_manager),
+            ("Панель настроек", self._init_settings_panel),
+            ("История", self._init_history),
+            ("Очередь", self._restore_jobs),
+            ("HTTP API", self._init_api),
+        ]
+        for widget in (self.add_btn, self.btn_start_all, self.btn_stop_all):
+            widget.setEnabled(False)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # если окно так и не отрисуется (например, свёрнуто), этапы всё равно запустятся
+        QTimer.singleShot(STARTUP_FALLBACK, self._start_stages)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.startup.first_paint is None:
+            self.startup.painted()
+            QTimer.singleShot(0, self._start_stages)
+
+    def add_startup_stage(self, name, callback):
+        self._startup_stages.append((name, callback))
+
+    def _start_stages(self):
+        if self.startup.running:
+            return
+        self.startup.running = True
+        self._run_startup_stage()
+
+    def _run_startup_stage(self):
+        # по одному этапу за проход цикла событий, чтобы окно успевало перерисовываться
+        name, stage = self._startup_stages.pop(0)
+        stage()
+        self.startup.mark(name)
+        if self._startup_stages:
+            QTimer.singleShot(0, self._run_startup_stage)
+            return
+        for widget in (self.add_btn, self.btn_start_all, self.btn_stop_all):
+            widget.setEnabled(True)
+        logger.info("%s", self.startup.report())
+
+    def _init_manager(self):
+        # движок, пул и http-сервер импортируются только здесь, после первой отрисовки
+        from func.loader import DownloadManager
+        from func.cache import MetadataCache
+        self.manager = DownloadManager(pool_size=self.settings.get("pool_size", 4),
+                                       max_downloads=self.settings.get("max_downloads", 4),
+                                       host_limits=self.settings.get("host_limits", {}),
+                                       progress_rate=self.settings.get("progress_rate", 5),
+                                       cache=MetadataCache(ttl=self.settings.get("cache_ttl_hours", 168) * 3600,
+                                                           max_entries=self.settings.get("cache_max_entries", 5000)),
+                                       state_path=STATE_FILE,
+                                       executor=self.settings.get("executor", "process"),
+                                       info_timeout=self.settings.get("info_timeout") or None,
+                                       stall_timeout=self.settings.get("stall_timeout") or None,
+                                       fragments=self.settings.get("concurrent_fragments", 4),
+                                       connections=self.settings.get("connections", 4),
+                                       bandwidth_limit=self.settings.get("bandwidth_limit_kbps", 0) * 1024,
+                                       job_limit=self.settings.get("job_limit_kbps", 0) * 1024,
+                                       bandwidth_schedule=self.settings.get("bandwidth_schedule") or None,
+                                       format_profile=self.settings.get("format_profile", "best"),
+                                       format_profiles=self.settings.get("format_profiles") or None,
+                                       audio_codec=self.settings.get("audio_codec", "best"))
+        self.manager.info_received.connect(self.on_info_received)
+        self.manager.info_error.connect(self.on_info_error)
+        self.manager.playlist_entries.connect(self.on_playlist_entries)
+        self.manager.playlist_finished.connect(self.on_playlist_finished)
+        self.manager.progress_changed.connect(self._route_progress)
+        self.manager.status_changed.connect(self._route_status)
+
+    def _init_settings_panel(self):
         settings_widget = QWidget()
         settings_layout = QVBoxLayout()
         settings_layout.setContentsMargins(6, 6, 6, 6)
@@ -404,35 +359,129 @@ class MainWindow(WindowAbs):
         self.list_white_rb.toggled.connect(self._on_list_mode_changed)
         self.list_black_rb.toggled.connect(self._on_list_mode_changed)
         self.list_edit.textChanged.connect(self._on_list_text_changed)
+        profile_layout = QHBoxLayout()
+        profile_layout.addWidget(QLabel("Формат:"))
+        self.profile_combo = QComboBox()
+        profiles = dict(PROFILES)
+        profiles.update(self.settings.get("format_profiles") or {})
+        for name, profile in profiles.items():
+            self.profile_combo.addItem(profile.get("title", name), name)
+        self.profile_combo.setCurrentIndex(max(0, self.profile_combo.findData(self.settings.get("format_profile"))))
+        self.profile_combo.currentIndexChanged.connect(self._on_profile_changed)
+        profile_layout.addWidget(self.profile_combo)
+        settings_layout.addLayout(profile_layout)
+        transfer_box = QGroupBox("Скорость загрузки")
+        transfer_layout = QVBoxLayout()
+        fragments_layout = QHBoxLayout()
+        fragments_layout.addWidget(QLabel("Фрагментов DASH/HLS параллельно:"))
+        self.fragments_spin = QSpinBox()
+        self.fragments_spin.setRange(1, 32)
+        self.fragments_spin.setValue(self.settings.get("concurrent_fragments", 4))
+        fragments_layout.addWidget(self.fragments_spin)
+        transfer_layout.addLayout(fragments_layout)
+        connections_layout = QHBoxLayout()
+        connections_layout.addWidget(QLabel("Соединений на обычный файл:"))
+        self.connections_spin = QSpinBox()
+        self.connections_spin.setRange(1, 32)
+        self.connections_spin.setValue(self.settings.get("connections", 4))
+        connections_layout.addWidget(self.connections_spin)
+        transfer_layout.addLayout(connections_layout)
+        limit_layout = QHBoxLayout()
+        limit_layout.addWidget(QLabel("Общий лимит, КБ/с (0 - нет):"))
+        self.bandwidth_spin = QSpinBox()
+        self.bandwidth_spin.setRange(0, 10_000_000)
+        self.bandwidth_spin.setValue(self.settings.get("bandwidth_limit_kbps", 0))
+        limit_layout.addWidget(self.bandwidth_spin)
+        transfer_layout.addLayout(limit_layout)
+        job_limit_layout = QHBoxLayout()
+        job_limit_layout.addWidget(QLabel("Лимит одной загрузки, КБ/с:"))
+        self.job_limit_spin = QSpinBox()
+        self.job_limit_spin.setRange(0, 10_000_000)
+        self.job_limit_spin.setValue(self.settings.get("job_limit_kbps", 0))
+        job_limit_layout.addWidget(self.job_limit_spin)
+        transfer_layout.addLayout(job_limit_layout)
+        transfer_box.setLayout(transfer_layout)
+        settings_layout.addWidget(transfer_box)
+        self.fragments_spin.valueChanged.connect(self.save_settings)
+        self.connections_spin.valueChanged.connect(self.save_settings)
+        self.bandwidth_spin.valueChanged.connect(self.save_settings)
+        self.job_limit_spin.valueChanged.connect(self.save_settings)
         settings_layout.addWidget(QLabel("Максимум записей в истории:"))
         self.history_limit_edit = QLineEdit(str(self.settings.get("history_limit", 50)))
         self.history_limit_edit.setMaximumWidth(80)
         self.history_limit_edit.textChanged.connect(self.save_settings)
         settings_layout.addWidget(self.history_limit_edit)
+        cache_layout = QHBoxLayout()
+        self.cache_stats_label = QLabel()
+        clear_cache_btn = QPushButton("Очистить кэш")
+        clear_cache_btn.clicked.connect(self.clear_cache)
+        cache_layout.addWidget(self.cache_stats_label)
+        cache_layout.addWidget(clear_cache_btn)
+        settings_layout.addLayout(cache_layout)
         settings_layout.addSpacerItem(QSpacerItem(0, 0, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
         settings_widget.setLayout(settings_layout)
         self.right_panel.addWidget(settings_widget)
-        main_layout.addWidget(self.right_panel)
-        self.manager.info_received.connect(self.on_info_received)
-        self.manager.info_error.connect(self.on_info_error)
         self._restore_proxy_ui()
         self._restore_list_ui()
-        if not self.history:
-            self.history_list.addItem("Пусто")
+
+    def _init_history(self):
+        from func.history import HistoryStore, HISTORY_DB
+        self.history = HistoryStore(HISTORY_DB, limit=self.settings.get("history_limit", 50))
+        self.history_search = QLineEdit()
+        self.history_search.setPlaceholderText("Поиск по истории")
+        self.history_search.textChanged.connect(self.update_history_ui)
+        self.left_panel.addWidget(self.history_search)
+        self.history_list = QListWidget()
+        self.history_list.setMinimumWidth(220)
+        self.left_panel.addWidget(self.history_list)
+        self.update_history_ui()
+
+    def _init_api(self):
+        if not self.settings.get("api_port"):
+            return
+        from func.server import ControlServer
+        # локальный HTTP API для очереди, 0 - выключен
+        self.api_server = ControlServer(self.manager.engine, port=int(self.settings["api_port"]))
+        try:
+            self.api_server.start()
+        except OSError as e:
+            self.api_server = None
+            logger.warning("HTTP API не запущен: %s", e)
 
     def _toggle_right(self):
+        self.update_cache_stats()
         self.right_panel.toggle()
 
+    def update_cache_stats(self):
+        if self.manager is None:
+            return
+        stats = self.manager.cache.stats()
+        self.cache_stats_label.setText(f"Кэш: {stats['entries']} записей, "
+                                       f"попаданий {stats['hits']}, промахов {stats['misses']}")
+
+    def clear_cache(self):
+        self.manager.cache.clear()
+        self.update_cache_stats()
+
     def browse_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Выбрать папку")
         if folder:
             self.out_dir_edit_right.setText(folder)
-            self.out_dir_edit_right.setText(folder)
-            self.save_settings()
 
     def sync_out_dir_fields(self):
         t = self.out_dir_edit_right.text().strip()
-        self.out_dir_edit_right.setText(t)
+        if t != self.out_dir_edit_right.text():
+            # без сигналов, чтобы setText не вызвал этот обработчик повторно
+            self.out_dir_edit_right.blockSignals(True)
+            self.out_dir_edit_right.setText(t)
+            self.out_dir_edit_right.blockSignals(False)
+        self.save_settings()
+
+    def _on_profile_changed(self):
+        self.settings["format_profile"] = self.profile_combo.currentData()
+        self.manager.set_format_profile(self.settings["format_profile"])
+        for idx in self.jobs_model.ids():
+            self._show_selection(idx)
         self.save_settings()
 
     def _on_proxy_mode_changed(self):
@@ -541,109 +590,220 @@ class MainWindow(WindowAbs):
         return proxy_str
 
     def load_settings(self):
-        if os.path.exists(SETTINGS_FILE):
-            try:
-                with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-                    self.settings.update(json.load(f))
-            except Exception:
-                pass
+        self.settings.update(self.settings_store.load())
 
     def save_settings(self):
         self.settings["out_dir"] = self.out_dir_edit_right.text().strip()
         self.settings["proxy_port"] = int(self.socks_port_spin.value())
         self.settings["proxy_custom"] = self.custom_edit.text().strip()
+        self.settings["concurrent_fragments"] = int(self.fragments_spin.value())
+        self.settings["connections"] = int(self.connections_spin.value())
+        self.manager.configure_transfer(self.settings["concurrent_fragments"], self.settings["connections"])
+        self.settings["bandwidth_limit_kbps"] = int(self.bandwidth_spin.value())
+        self.settings["job_limit_kbps"] = int(self.job_limit_spin.value())
+        # расписание по времени суток задаётся в settings.json: [{"from": "09:00", "to": "18:00", "limit_kbps": 2048}]
+        self.manager.configure_bandwidth(self.settings["bandwidth_limit_kbps"] * 1024,
+                                         self.settings["job_limit_kbps"] * 1024)
         try:
             self.settings["history_limit"] = int(self.history_limit_edit.text())
         except Exception:
             self.settings["history_limit"] = 50
-        try:
-            with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.settings, f, indent=4, ensure_ascii=False)
-        except Exception:
-            pass
-
-    def load_history(self):
-        if os.path.exists(HISTORY_FILE):
-            try:
-                with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                    self.history = json.load(f)
-            except Exception:
-                self.history = []
-        else:
-            self.history = []
+        self.settings_timer.start()
 
-    def save_history(self):
+    def flush_settings(self):
+        self.settings_timer.stop()
         try:
-            limit = self.settings.get("history_limit", 50)
-            self.history = self.history[-limit:]
-            with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.history, f, indent=4, ensure_ascii=False)
+            self.settings_store.save(self.settings)
         except Exception:
             pass
-        self.update_history_ui()
 
     def update_history_ui(self):
         self.history_list.clear()
-        if not self.history:
+        entries = self.history.search(self.history_search.text(), self.settings.get("history_limit", 50))
+        if not entries:
             self.history_list.addItem("Пусто")
-        else:
-            for entry in reversed(self.history):
-                title = entry.get('title', 'Без названия')
-                url = entry.get('url', '')
-                self.history_list.addItem(f"{title} — {url}")
+        for entry in entries:
+            self.history_list.addItem(f"{entry['title']} — {entry['url']}")
+
+    def add_history(self, url, title):
+        self.history.limit = self.settings.get("history_limit", 50)
+        self.history.add(url, title)
+        if self.history_search.text().strip():
+            # при активном поиске список пересобирается запросом к индексу
+            self.update_history_ui()
+            return
+        # без поиска - новая строка сверху, самые старые уходят снизу
+        if self.history_list.count() == 1 and len(self.history) == 1:
+            self.history_list.clear()
+        self.history_list.insertItem(0, f"{title} — {url}")
+        while self.history_list.count() > max(1, self.history.limit):
+            self.history_list.takeItem(self.history_list.count() - 1)
 
     def add_video(self):
         url = self.url_edit.text().strip()
         if not url:
             return
-        _, index = self.manager.add_video(url)
+        mode = "audio" if self.audio_cb.isChecked() else "video"
+        outtmpl = self.settings.get(f"{mode}_template") or None
+        if self.playlist_cb.isChecked():
+            self.manager.proxy = self._get_proxy_str(url)
+            self.manager.expand_playlist(url, mode, outtmpl)
+            self.url_edit.clear()
+            return
+        _, index = self.manager.add_video(url, mode=mode, outtmpl=outtmpl)
         if _ == 0:
-            if index in self.cards:
-                self.cards[index].highlight_card()
+            if index in self.jobs_model:
+                self.jobs_model.flash(index)
                 return
-            self.manager.queue[index]['status'] = "queued"
-        card = DownloadCard(index, "Получаем информацию...", url, self.manager, self.remove_video, self)
-        self.cards[index] = card
-        item = QListWidgetItem()
-        item.setSizeHint(card.sizeHint())
-        self.list_widget.addItem(item)
-        self.list_widget.setItemWidget(item, card)
+            self.manager.jobs[index]['status'] = "queued"
+        self.jobs_model.add_job(index, "Получаем информацию...", url)
         proxy = self._get_proxy_str(url)
         print(proxy)
         self.manager.proxy = proxy
         self.manager.get_info(index)
         self.url_edit.clear()
 
+    def _on_job_action(self, index, action):
+        if action == 'refresh':
+            self.refresh_job(index)
+        elif action == 'start':
+            self.start_job(index)
+        elif action == 'stop':
+            self.stop_job(index)
+        elif action == 'show':
+            self.show_in_folder(index)
+        elif action == 'remove':
+            self.remove_video(index)
+
+    def start_job(self, index):
+        url = self.manager.jobs[index]['url']
+        self.manager.out_dir = self.out_dir_edit_right.text().strip() or "."
+        self.manager.proxy = self._get_proxy_str(url)
+        self.jobs_model.update(index, status="Запуск...",
+                               enabled={'start': False, 'stop': True, 'show': False, 'remove': False})
+        self.manager.start_download(index)
+
+    def stop_job(self, index):
+        self.manager.stop_download(index)
+        self._set_paused(index, "Остановка...")
+
+    def _set_paused(self, index, status):
+        self.jobs_model.update(index, status=status, start_text="Продолжить",
+                               enabled={'start': True, 'stop': False, 'show': True, 'remove': True})
+
+    def refresh_job(self, index):
+        self.jobs_model.update(index, title="Получаем информацию...", enabled={'start': False})
+        self.manager.proxy = self._get_proxy_str(self.manager.jobs[index]['url'])
+        self.manager.get_info(index, refresh=True)
+
+    def _show_selection(self, index):
+        selection = self.manager.jobs[index].get("selection")
+        self.jobs_model.update(index, format=f"Формат: {selection['label']}" if selection else "")
+
+    def show_in_folder(self, index):
+        filepath = (self.manager.jobs[index].get("_filepath") or "").replace("/", "\\")
+        if os.path.exists(filepath):
+            path = f"explorer /select, \"{filepath}\""
+            print(path)
+            os.system(path)
+        else:
+            QMessageBox.warning(self, "Ошибка", "Файл не найден, возможно вы его уже удалили!")
+            out_dir = self.out_dir_edit_right.text().strip() or "."
+            os.system("start "+out_dir)
+
+    def _restore_jobs(self):
+        restored = self.manager.restore()
+        self.jobs_model.add_jobs([(index, self.manager.jobs[index].get('title') or self.manager.jobs[index]['url'],
+                                   self.manager.jobs[index]['url']) for index in restored])
+        for index in restored:
+            status = self.manager.jobs[index].get('status')
+            if status in ('waiting', 'downloading', 'postprocessing'):
+                self.start_job(index)
+            elif status == 'paused':
+                self._set_paused(index, "Пауза")
+            elif status == 'error':
+                self._set_paused(index, "Ошибка, можно продолжить")
+            else:
+                self.jobs_model.update(index, enabled={'start': True})
+
+    def on_playlist_entries(self, playlist_id, entries):
+        self.jobs_model.add_jobs([(index, title or url, url) for index, url, title in entries])
+        for index, _, _ in entries:
+            self.jobs_model.update(index, status="Из плейлиста", enabled={'start': True})
+
+    def on_playlist_finished(self, playlist_id, ok, msg):
+        if not ok:
+            QMessageBox.warning(self, "Playlist error", msg)
+
     def start_all(self):
         self.manager.out_dir = self.out_dir_edit_right.text().strip() or "."
-        for idx in list(self.cards.keys()):
-            if self.cards.get(idx).btn_start.isEnabled():
-                self.cards.get(idx).btn_start.click()
+        for idx in self.jobs_model.ids():
+            if self.jobs_model.state(idx)['enabled']['start']:
+                self.start_job(idx)
 
     def stop_all(self):
-        for idx in list(self.cards.keys()):
-            if self.cards.get(idx).btn_stop.isEnabled():
-                self.cards.get(idx).btn_stop.click()
+        for idx in self.jobs_model.ids():
+            if self.jobs_model.state(idx)['enabled']['stop']:
+                self.stop_job(idx)
 
     def remove_video(self, index):
-        if index not in self.cards:
+        if index not in self.jobs_model:
             return
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            widget = self.list_widget.itemWidget(item)
-            if widget == self.cards[index]:
-                self.list_widget.takeItem(i)
-                widget.deleteLater()
-                break
-        del self.cards[index]
-        if 0 <= index < len(self.manager.queue):
-            self.manager.queue[index]['status'] = 'removed'
+        self.jobs_model.remove_job(index)
+        self.manager.remove_video(index)
+
+    def _route_progress(self, idx, percent):
+        self.jobs_model.update(idx, progress=int(percent))
+
+    def _route_status(self, idx, status):
+        if idx not in self.jobs_model and idx in self.manager.jobs:
+            # задача пришла через HTTP API, строки для неё ещё нет
+            item = self.manager.jobs[idx]
+            self.jobs_model.add_job(idx, item.get('title') or item['url'], item['url'])
+            self.jobs_model.update(idx, enabled={'start': False, 'stop': True, 'remove': False})
+        if idx not in self.jobs_model:
+            return
+        if status == "Пауза":
+            self._set_paused(idx, status)
+            return
+        lowered = status.lower() if status else ""
+        finished_keywords = ("заверш", "файл готов", "ошибк")
+        if any(k in lowered for k in finished_keywords):
+            self.jobs_model.update(idx, status=status,
+                                   enabled={'start': False, 'stop': False, 'remove': True, 'show': True})
+        else:
+            self.jobs_model.update(idx, status=status)
 
     def on_info_received(self, idx, info):
+        if idx in self.jobs_model:
+            self._on_job_info(idx, info)
         title = info.get("title", "Без названия")
-        url = info.get("webpage_url", self.manager.queue[idx]["url"])
-        self.history.append({"title": title, "url": url})
-        self.save_history()
+        url = info.get("webpage_url") or self.manager.jobs[idx]["url"]
+        self.add_history(url, title)
+
+    def _on_job_info(self, index, info):
+        title = info.get('title', 'Без названия')
+        out_dir = self.out_dir_edit_right.text().strip() or "."
+        selection = self.manager.jobs[index].get("selection")
+        self._show_selection(index)
+        ext = (selection or {}).get("ext") or info.get("ext") or "mp4"
+        filename = f"{title}.{ext}"
+        self.manager.jobs[index]["_filename"] = filename
+        filepath = os.path.join(out_dir, filename)
+        print(title, ext, filepath)
+        exists = os.path.exists(filepath)
+        self.jobs_model.update(index, title=title, enabled={'start': not exists, 'show': exists})
+        self.manager.jobs[index]["_filepath"] = filepath
+
+    def closeEvent(self, event):
+        self.flush_settings()
+        if self.api_server is not None:
+            self.api_server.stop()
+        if self.manager is not None:
+            self.manager.shutdown()
+        if self.history is not None:
+            self.history.close()
+        super().closeEvent(event)
 
     def on_info_error(self, idx, msg):
         QMessageBox.warning(self, "Info error", f"{idx}: {msg}")
\ No newline at end of file
@@ -0,0 +1,100 @@
+from PyQt6.QtCore import Qt, QEvent, pyqtSignal
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout
+
+from ui.titleBar import StandardTitleBar
+
+EDGE_CURSORS = {
+    Qt.Edge.LeftEdge: Qt.CursorShape.SizeHorCursor,
+    Qt.Edge.RightEdge: Qt.CursorShape.SizeHorCursor,
+    Qt.Edge.TopEdge: Qt.CursorShape.SizeVerCursor,
+    Qt.Edge.BottomEdge: Qt.CursorShape.SizeVerCursor,
+    Qt.Edge.TopEdge | Qt.Edge.LeftEdge: Qt.CursorShape.SizeFDiagCursor,
+    Qt.Edge.BottomEdge | Qt.Edge.RightEdge: Qt.CursorShape.SizeFDiagCursor,
+    Qt.Edge.TopEdge | Qt.Edge.RightEdge: Qt.CursorShape.SizeBDiagCursor,
+    Qt.Edge.BottomEdge | Qt.Edge.LeftEdge: Qt.CursorShape.SizeBDiagCursor,
+}
+
+
+class QtFramelessWindow(QMainWindow):
+    # то же окно без рамки, что и на Windows, но только средствами Qt: перемещение и размер отдаёт оконной системе
+    BORDER_WIDTH = 8
+    resizeSignal = pyqtSignal(object)
+    moveSignal = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._titleBar = StandardTitleBar(self)
+        self._isResizeEnabled = True
+        self._edges = None
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
+        # события мыши QWindow видит раньше дочерних виджетов, поэтому края ловим на нём
+        self.winId()
+        self.windowHandle().installEventFilter(self)
+        self.setMinimumSize(300, 200)
+        self.resize(500, 500)
+
+    def setCentralWidget(self, widget: QWidget):
+        container = QWidget()
+        container.setObjectName("WindowsFramelessWindowCentralContainer")
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self._titleBar)
+        layout.addWidget(widget)
+        super().setCentralWidget(container)
+
+    def _edgesAt(self, pos):
+        if not self._isResizeEnabled or self.isMaximized() or self.isFullScreen():
+            return None
+        bw = self.BORDER_WIDTH
+        edges = Qt.Edge(0)
+        if pos.x() < bw:
+            edges |= Qt.Edge.LeftEdge
+        elif pos.x() > self.width() - bw:
+            edges |= Qt.Edge.RightEdge
+        if pos.y() < bw:
+            edges |= Qt.Edge.TopEdge
+        elif pos.y() > self.height() - bw:
+            edges |= Qt.Edge.BottomEdge
+        return edges or None
+
+    def eventFilter(self, obj, e):
+        if obj is self.windowHandle():
+            if e.type() == QEvent.Type.MouseMove and e.buttons() == Qt.MouseButton.NoButton:
+                edges = self._edgesAt(e.position().toPoint())
+                if edges != self._edges:
+                    self._edges = edges
+                    if edges is None:
+                        self.unsetCursor()
+                    else:
+                        self.setCursor(EDGE_CURSORS[edges])
+            elif e.type() == QEvent.Type.MouseButtonPress and e.button() == Qt.MouseButton.LeftButton:
+                edges = self._edgesAt(e.position().toPoint())
+                if edges is not None and self.windowHandle().startSystemResize(edges):
+                    return True
+            elif e.type() == QEvent.Type.Leave and self._edges is not None:
+                self._edges = None
+                self.unsetCursor()
+        return super().eventFilter(obj, e)
+
+    def toggleMaxState(self):
+        if self.isMaximized():
+            self.showNormal()
+        else:
+            self.showMaximized()
+
+    def startWindowMove(self):
+        self.windowHandle().startSystemMove()
+
+    def updateWindowState(self):
+        self._titleBar.maxBtn.setMaxState(self.isMaximized())
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._titleBar.setFixedWidth(self.width())
+        self.resizeSignal.emit(event.size())
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.moveSignal.emit(event.pos())
@@ -6,13 +6,15 @@ from ctypes.wintypes import BOOL, DWORD, HWND, LONG, LPCVOID, POINT, UINT, ULONG
 import win32api
 import win32con
 import win32gui
-from PyQt6.QtCore import QFile, QPointF, QRectF, Qt, QEvent, QSize, QRect, pyqtProperty, QTimer, QPoint, pyqtSignal
-from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPen, QIcon, QCursor, QCloseEvent, QResizeEvent
-from PyQt6.QtWidgets import QApplication, QWidget, QAbstractButton, QLabel, QHBoxLayout, QMainWindow, QVBoxLayout, \
+from PyQt6.QtCore import QFile, QPointF, QRectF, Qt, QSize, pyqtProperty, QTimer, QPoint, pyqtSignal
+from PyQt6.QtGui import QColor, QPainterPath, QCursor, QCloseEvent, QResizeEvent
+from PyQt6.QtWidgets import QApplication, QWidget, QMainWindow, QVBoxLayout, \
     QSizePolicy, QGraphicsView, QGraphicsScene, QGraphicsProxyWidget
 from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtXml import QDomDocument
 
+from ui.titleBar import StandardTitleBar
+
 class WINDOWCOMPOSITIONATTRIB(Enum):
     WCA_UNDEFINED = 0
     WCA_NCRENDERING_ENABLED = 1
@@ -267,286 +269,6 @@ class WindowsWindowEffect:
         hWnd = int(hWnd)
         self.DwmSetWindowAttribute(hWnd, 34, byref(DWORD(0xFFFFFFFF)), 4)
 
-class TitleBarButtonState(Enum):
-    NORMAL = 0
-    HOVER = 1
-    PRESSED = 2
-
-class TitleBarButton(QAbstractButton):
-    def __init__(self, parent=None):
-        super().__init__(parent=parent)
-        self.setCursor(Qt.CursorShape.ArrowCursor)
-        self.setFixedSize(46, 32)
-        self._state = TitleBarButtonState.NORMAL
-        self._normalColor = QColor(0, 0, 0)
-        self._hoverColor = QColor(0, 0, 0)
-        self._pressedColor = QColor(0, 0, 0)
-        self._normalBgColor = QColor(0, 0, 0, 0)
-        self._hoverBgColor = QColor(0, 0, 0, 26)
-        self._pressedBgColor = QColor(0, 0, 0, 51)
-
-    def setState(self, state):
-        self._state = state
-        self.update()
-
-    def isPressed(self):
-        return self._state == TitleBarButtonState.PRESSED
-
-    def _getColors(self):
-        if self._state == TitleBarButtonState.NORMAL:
-            return self._normalColor, self._normalBgColor
-        elif self._state == TitleBarButtonState.HOVER:
-            return self._hoverColor, self._hoverBgColor
-        return self._pressedColor, self._pressedBgColor
-
-    def setHoverColor(self, color):
-        self._hoverColor = QColor(color)
-        self.update()
-
-    def setPressedColor(self, color):
-        self._pressedColor = QColor(color)
-        self.update()
-
-    def setHoverBackgroundColor(self, color):
-        self._hoverBgColor = QColor(color)
-        self.update()
-
-    def setPressedBackgroundColor(self, color):
-        self._pressedBgColor = QColor(color)
-        self.update()
-
-    def enterEvent(self, e):
-        self.setState(TitleBarButtonState.HOVER)
-        super().enterEvent(e)
-
-    def leaveEvent(self, e):
-        self.setState(TitleBarButtonState.NORMAL)
-        super().leaveEvent(e)
-
-    def mousePressEvent(self, e):
-        if e.button() != Qt.MouseButton.LeftButton:
-            return
-        self.setState(TitleBarButtonState.PRESSED)
-        super().mousePressEvent(e)
-
-
-class MinimizeButton(TitleBarButton):
-    def paintEvent(self, e):
-        painter = QPainter(self)
-        _, bgColor = self._getColors()
-
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setBrush(bgColor)
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawRect(self.rect())
-
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        pen = QPen(Qt.GlobalColor.white, 1.3)
-        pen.setCosmetic(True)
-        painter.setPen(pen)
-        painter.drawLine(18, 16, 28, 16)
-
-
-class MaximizeButton(TitleBarButton):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._isMax = False
-
-    def setMaxState(self, isMax):
-        if self._isMax == isMax:
-            return
-        self._isMax = isMax
-        self.setState(TitleBarButtonState.NORMAL)
-
-    def paintEvent(self, e):
-        painter = QPainter(self)
-        _, bgColor = self._getColors()
-
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setBrush(bgColor)
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawRect(self.rect())
-
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        pen = QPen(Qt.GlobalColor.white, 1.3)
-        pen.setCosmetic(True)
-        painter.setPen(pen)
-
-        r = self.devicePixelRatioF()
-        painter.scale(1 / r, 1 / r)
-
-        if not self._isMax:
-            painter.drawRect(int(18 * r), int(11 * r), int(10 * r), int(10 * r))
-        else:
-            painter.drawRect(int(18 * r), int(13 * r), int(8 * r), int(8 * r))
-
-            x0 = int(18 * r) + int(2 * r)
-            y0 = int(13 * r) - int(2 * r)
-            painter.drawRect(x0, y0, int(8 * r), int(8 * r))
-
-
-class CloseButton(TitleBarButton):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setHoverBackgroundColor(QColor(232, 17, 35))
-        self.setPressedBackgroundColor(QColor(241, 112, 122))
-
-    def paintEvent(self, e):
-        painter = QPainter(self)
-        _, bgColor = self._getColors()
-
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.fillRect(self.rect(), bgColor)
-
-        pen = QPen(Qt.GlobalColor.white, 1.3)
-        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-        painter.setPen(pen)
-
-        w, h = self.width(), self.height()
-        center_x = w // 2
-        center_y = h // 2
-        size = 4
-        painter.drawLine(center_x - size, center_y - size,
-                         center_x + size, center_y + size)
-        painter.drawLine(center_x + size, center_y - size,
-                         center_x - size, center_y + size)
-
-class TitleBarBase(QWidget):
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.minBtn = MinimizeButton(parent=self)
-        self.closeBtn = CloseButton(parent=self)
-        self.maxBtn = MaximizeButton(parent=self)
-        self._isDoubleClickEnabled = True
-        self.resize(200, 32)
-        self.setFixedHeight(32)
-        self.minBtn.clicked.connect(self.window().showMinimized)
-        self.maxBtn.clicked.connect(self.__toggleMaxState)
-        self.closeBtn.clicked.connect(self.window().close)
-        self.window().installEventFilter(self)
-
-    def eventFilter(self, obj, e):
-        if obj is self.window() and e.type() == QEvent.Type.WindowStateChange:
-            self.window().updateWindowState()
-            return False
-        return super().eventFilter(obj, e)
-
-    def mouseDoubleClickEvent(self, event):
-        if event.button() != Qt.MouseButton.LeftButton or not self._isDoubleClickEnabled:
-            return
-        self.__toggleMaxState()
-
-    def mouseMoveEvent(self, e):
-        if sys.platform != "win32" or not self.canDrag(e.pos()):
-            return
-        self.window().windowEffect.moveWindow(self.window().winId())
-
-    def mousePressEvent(self, e):
-        if sys.platform == "win32" or not self.canDrag(e.pos()):
-            return
-        self.window().windowEffect.moveWindow(self.window().winId())
-
-    def __toggleMaxState(self):
-        toggleMaxState(self.window())
-        self.window().updateWindowState()
-
-    def _isDragRegion(self, pos):
-        width = sum(btn.width() for btn in self.findChildren(TitleBarButton) if btn.isVisible())
-        return 0 < pos.x() < self.width() - width
-
-    def _hasButtonPressed(self):
-        return any(btn.isPressed() for btn in self.findChildren(TitleBarButton))
-
-    def canDrag(self, pos):
-        return self._isDragRegion(pos) and not self._hasButtonPressed()
-
-class TitleBar(TitleBarBase):
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.hBoxLayout = QHBoxLayout(self)
-        self.hBoxLayout.setSpacing(0)
-        self.hBoxLayout.setContentsMargins(0, 0, 0, 0)
-        self.hBoxLayout.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
-        self.hBoxLayout.addStretch(1)
-        self.hBoxLayout.addWidget(self.minBtn, 0, Qt.AlignmentFlag.AlignRight)
-        self.hBoxLayout.addWidget(self.maxBtn, 0, Qt.AlignmentFlag.AlignRight)
-        self.hBoxLayout.addWidget(self.closeBtn, 0, Qt.AlignmentFlag.AlignRight)
-
-class StandardTitleBar(TitleBar):
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.iconLabel = QLabel(self)
-        self.iconLabel.setFixedSize(25, 25)
-        self.hBoxLayout.insertSpacing(0, 10)
-        self.hBoxLayout.insertWidget(1, self.iconLabel, 0, Qt.AlignmentFlag.AlignLeft)
-        self.window().windowIconChanged.connect(self.setIcon)
-
-        self.titleLabel = QLabel(self)
-        self.hBoxLayout.insertWidget(2, self.titleLabel, 0, Qt.AlignmentFlag.AlignLeft)
-        self.titleLabel.setStyleSheet("""
-            QLabel{
-                background: transparent;
-                font: 13px 'Segoe UI';
-                padding: 0 4px
-            }
-        """)
-        self.window().windowTitleChanged.connect(self.setTitle)
-
-        self.titleLabel.installEventFilter(self)
-        self.installEventFilter(self)
-
-    def eventFilter(self, obj, event):
-        if event.type() == event.Type.Resize or event.type() == event.Type.LayoutRequest:
-            if obj in (self, self.titleLabel):
-                self.adjustTitleVisibility()
-        return super().eventFilter(obj, event)
-
-    def adjustTitleVisibility(self):
-        if self.titleLabel.pos().x() > self.width()*2//3:
-            self.titleLabel.setFixedWidth(1)
-        else:
-            self.titleLabel.setMaximumWidth(200)
-
-    def setTitle(self, title):
-        self.titleLabel.setText(title)
-        self.titleLabel.adjustSize()
-
-    def setIcon(self, icon):
-        self.iconLabel.setPixmap(QIcon(icon).pixmap(25, 25))
-
-class DragOverlay(QWidget):
-    def __init__(self, parent, title_bar, window_effect):
-        super().__init__(parent)
-        self._title_bar = title_bar
-        self._window_effect = window_effect
-        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
-        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, False)
-        self.setMouseTracking(True)
-        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.setVisible(True)
-        self.raise_()
-        self.update_geometry()
-
-    def update_geometry(self):
-        top_left = self._title_bar.mapTo(self.parent(), QPoint(0, 0))
-        self.setGeometry(QRect(top_left, self._title_bar.size()))
-        self.raise_()
-
-    def mousePressEvent(self, e):
-        if e.button() == Qt.MouseButton.LeftButton:
-            self._window_effect.moveWindow(self.window().winId())
-            e.accept()
-        else:
-            e.ignore()
-
-    def mouseDoubleClickEvent(self, e):
-        if e.button() == Qt.MouseButton.LeftButton:
-            toggleMaxState(self.window())
-            self.window().updateWindowState()
-            e.accept()
-        else:
-            e.ignore()
-
 class WindowsFramelessWindow(QMainWindow):
     BORDER_WIDTH = 8
     DWMWA_USE_IMMERSIVE_DARK_MODE = 20
@@ -693,6 +415,12 @@ class WindowsFramelessWindow(QMainWindow):
             return True, 0
         return False, 0
 
+    def toggleMaxState(self):
+        toggleMaxState(self)
+
+    def startWindowMove(self):
+        self.windowEffect.moveWindow(self.winId())
+
     def updateWindowState(self):
         self.windowEffect.addShadowEffect(self.winId())
         self._titleBar.maxBtn.setMaxState(self.isMaximized())
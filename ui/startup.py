@@ -0,0 +1,34 @@
+import time
+
+# отсчёт от импорта модуля: main.py импортирует его первым
+PROCESS_START = time.perf_counter()
+FIRST_PAINT_TARGET = 0.3
+
+
+class StartupReport:
+    def __init__(self, start=PROCESS_START):
+        self.start = start
+        self.last = start
+        self.stages = []
+        self.running = False
+        self.first_paint = None
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.stages.append((name, now - self.last))
+        self.last = now
+
+    def painted(self):
+        if self.first_paint is None:
+            self.mark("Первая отрисовка")
+            self.first_paint = self.last - self.start
+
+    def report(self):
+        lines = [f"Запуск: {(self.last - self.start) * 1000:.0f} мс"]
+        for name, duration in self.stages:
+            lines.append(f"  {name}: {duration * 1000:.0f} мс")
+        if self.first_paint is not None:
+            over = " - дольше цели!" if self.first_paint > FIRST_PAINT_TARGET else ""
+            lines.append(f"  до первой отрисовки: {self.first_paint * 1000:.0f} мс"
+                         f" (цель {FIRST_PAINT_TARGET * 1000:.0f} мс){over}")
+        return "\n".join(lines)
@@ -0,0 +1,254 @@
+import sys
+from enum import Enum
+
+from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtGui import QColor, QPainter, QPen, QIcon
+from PyQt6.QtWidgets import QWidget, QAbstractButton, QLabel, QHBoxLayout
+
+
+class TitleBarButtonState(Enum):
+    NORMAL = 0
+    HOVER = 1
+    PRESSED = 2
+
+class TitleBarButton(QAbstractButton):
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.setCursor(Qt.CursorShape.ArrowCursor)
+        self.setFixedSize(46, 32)
+        self._state = TitleBarButtonState.NORMAL
+        self._normalColor = QColor(0, 0, 0)
+        self._hoverColor = QColor(0, 0, 0)
+        self._pressedColor = QColor(0, 0, 0)
+        self._normalBgColor = QColor(0, 0, 0, 0)
+        self._hoverBgColor = QColor(0, 0, 0, 26)
+        self._pressedBgColor = QColor(0, 0, 0, 51)
+
+    def setState(self, state):
+        self._state = state
+        self.update()
+
+    def isPressed(self):
+        return self._state == TitleBarButtonState.PRESSED
+
+    def _getColors(self):
+        if self._state == TitleBarButtonState.NORMAL:
+            return self._normalColor, self._normalBgColor
+        elif self._state == TitleBarButtonState.HOVER:
+            return self._hoverColor, self._hoverBgColor
+        return self._pressedColor, self._pressedBgColor
+
+    def setHoverColor(self, color):
+        self._hoverColor = QColor(color)
+        self.update()
+
+    def setPressedColor(self, color):
+        self._pressedColor = QColor(color)
+        self.update()
+
+    def setHoverBackgroundColor(self, color):
+        self._hoverBgColor = QColor(color)
+        self.update()
+
+    def setPressedBackgroundColor(self, color):
+        self._pressedBgColor = QColor(color)
+        self.update()
+
+    def enterEvent(self, e):
+        self.setState(TitleBarButtonState.HOVER)
+        super().enterEvent(e)
+
+    def leaveEvent(self, e):
+        self.setState(TitleBarButtonState.NORMAL)
+        super().leaveEvent(e)
+
+    def mousePressEvent(self, e):
+        if e.button() != Qt.MouseButton.LeftButton:
+            return
+        self.setState(TitleBarButtonState.PRESSED)
+        super().mousePressEvent(e)
+
+
+class MinimizeButton(TitleBarButton):
+    def paintEvent(self, e):
+        painter = QPainter(self)
+        _, bgColor = self._getColors()
+
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setBrush(bgColor)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRect(self.rect())
+
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        pen = QPen(Qt.GlobalColor.white, 1.3)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
+        painter.drawLine(18, 16, 28, 16)
+
+
+class MaximizeButton(TitleBarButton):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._isMax = False
+
+    def setMaxState(self, isMax):
+        if self._isMax == isMax:
+            return
+        self._isMax = isMax
+        self.setState(TitleBarButtonState.NORMAL)
+
+    def paintEvent(self, e):
+        painter = QPainter(self)
+        _, bgColor = self._getColors()
+
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setBrush(bgColor)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRect(self.rect())
+
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        pen = QPen(Qt.GlobalColor.white, 1.3)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
+
+        r = self.devicePixelRatioF()
+        painter.scale(1 / r, 1 / r)
+
+        if not self._isMax:
+            painter.drawRect(int(18 * r), int(11 * r), int(10 * r), int(10 * r))
+        else:
+            painter.drawRect(int(18 * r), int(13 * r), int(8 * r), int(8 * r))
+
+            x0 = int(18 * r) + int(2 * r)
+            y0 = int(13 * r) - int(2 * r)
+            painter.drawRect(x0, y0, int(8 * r), int(8 * r))
+
+
+class CloseButton(TitleBarButton):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setHoverBackgroundColor(QColor(232, 17, 35))
+        self.setPressedBackgroundColor(QColor(241, 112, 122))
+
+    def paintEvent(self, e):
+        painter = QPainter(self)
+        _, bgColor = self._getColors()
+
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), bgColor)
+
+        pen = QPen(Qt.GlobalColor.white, 1.3)
+        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        painter.setPen(pen)
+
+        w, h = self.width(), self.height()
+        center_x = w // 2
+        center_y = h // 2
+        size = 4
+        painter.drawLine(center_x - size, center_y - size,
+                         center_x + size, center_y + size)
+        painter.drawLine(center_x + size, center_y - size,
+                         center_x - size, center_y + size)
+
+class TitleBarBase(QWidget):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.minBtn = MinimizeButton(parent=self)
+        self.closeBtn = CloseButton(parent=self)
+        self.maxBtn = MaximizeButton(parent=self)
+        self._isDoubleClickEnabled = True
+        self.resize(200, 32)
+        self.setFixedHeight(32)
+        self.minBtn.clicked.connect(self.window().showMinimized)
+        self.maxBtn.clicked.connect(self.__toggleMaxState)
+        self.closeBtn.clicked.connect(self.window().close)
+        self.window().installEventFilter(self)
+
+    def eventFilter(self, obj, e):
+        if obj is self.window() and e.type() == QEvent.Type.WindowStateChange:
+            self.window().updateWindowState()
+            return False
+        return super().eventFilter(obj, e)
+
+    def mouseDoubleClickEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton or not self._isDoubleClickEnabled:
+            return
+        self.__toggleMaxState()
+
+    def mouseMoveEvent(self, e):
+        if sys.platform != "win32" or not self.canDrag(e.pos()):
+            return
+        self.window().startWindowMove()
+
+    def mousePressEvent(self, e):
+        if sys.platform == "win32" or not self.canDrag(e.pos()):
+            return
+        self.window().startWindowMove()
+
+    def __toggleMaxState(self):
+        self.window().toggleMaxState()
+        self.window().updateWindowState()
+
+    def _isDragRegion(self, pos):
+        width = sum(btn.width() for btn in self.findChildren(TitleBarButton) if btn.isVisible())
+        return 0 < pos.x() < self.width() - width
+
+    def _hasButtonPressed(self):
+        return any(btn.isPressed() for btn in self.findChildren(TitleBarButton))
+
+    def canDrag(self, pos):
+        return self._isDragRegion(pos) and not self._hasButtonPressed()
+
+class TitleBar(TitleBarBase):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.hBoxLayout = QHBoxLayout(self)
+        self.hBoxLayout.setSpacing(0)
+        self.hBoxLayout.setContentsMargins(0, 0, 0, 0)
+        self.hBoxLayout.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
+        self.hBoxLayout.addStretch(1)
+        self.hBoxLayout.addWidget(self.minBtn, 0, Qt.AlignmentFlag.AlignRight)
+        self.hBoxLayout.addWidget(self.maxBtn, 0, Qt.AlignmentFlag.AlignRight)
+        self.hBoxLayout.addWidget(self.closeBtn, 0, Qt.AlignmentFlag.AlignRight)
+
+class StandardTitleBar(TitleBar):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.iconLabel = QLabel(self)
+        self.iconLabel.setFixedSize(25, 25)
+        self.hBoxLayout.insertSpacing(0, 10)
+        self.hBoxLayout.insertWidget(1, self.iconLabel, 0, Qt.AlignmentFlag.AlignLeft)
+        self.window().windowIconChanged.connect(self.setIcon)
+
+        self.titleLabel = QLabel(self)
+        self.hBoxLayout.insertWidget(2, self.titleLabel, 0, Qt.AlignmentFlag.AlignLeft)
+        self.titleLabel.setStyleSheet("""
+            QLabel{
+                background: transparent;
+                font: 13px 'Segoe UI';
+                padding: 0 4px
+            }
+        """)
+        self.window().windowTitleChanged.connect(self.setTitle)
+
+        self.titleLabel.installEventFilter(self)
+        self.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == event.Type.Resize or event.type() == event.Type.LayoutRequest:
+            if obj in (self, self.titleLabel):
+                self.adjustTitleVisibility()
+        return super().eventFilter(obj, event)
+
+    def adjustTitleVisibility(self):
+        if self.titleLabel.pos().x() > self.width()*2//3:
+            self.titleLabel.setFixedWidth(1)
+        else:
+            self.titleLabel.setMaximumWidth(200)
+
+    def setTitle(self, title):
+        self.titleLabel.setText(title)
+        self.titleLabel.adjustSize()
+
+    def setIcon(self, icon):
+        self.iconLabel.setPixmap(QIcon(icon).pixmap(25, 25))
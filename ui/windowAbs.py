@@ -3,10 +3,22 @@ from PyQt6.QtWidgets import (
     QPushButton, QApplication, QLabel,
     QSizeGrip, QVBoxLayout, QFrame, QToolButton, QMenu, QDialog, QStyle
 )
-from PyQt6.QtCore import Qt, QPoint, QRect, QEvent, QVariantAnimation, QEasingCurve, QTimer, QSize, QPointF, QRectF
+from PyQt6.QtCore import Qt, QPoint, QRect, QEvent, QVariantAnimation, QEasingCurve, QSize, QPointF, QRectF
 from PyQt6.QtGui import QMouseEvent, QResizeEvent, QAction, QCursor, QPainterPath, QPainter, QColor, QBrush, QPen
 
-from ui.WindowsAbstractWindow import WindowsFramelessWindow
+from ui.FramelessWindow import FramelessWindow
+
+
+RESIZE_EDGES = {
+    "top": Qt.Edge.TopEdge,
+    "bottom": Qt.Edge.BottomEdge,
+    "left": Qt.Edge.LeftEdge,
+    "right": Qt.Edge.RightEdge,
+    "top_left": Qt.Edge.TopEdge | Qt.Edge.LeftEdge,
+    "top_right": Qt.Edge.TopEdge | Qt.Edge.RightEdge,
+    "bottom_left": Qt.Edge.BottomEdge | Qt.Edge.LeftEdge,
+    "bottom_right": Qt.Edge.BottomEdge | Qt.Edge.RightEdge,
+}
 
 
 class CustomTitleBar(QFrame):
@@ -170,10 +182,8 @@ class WindowManager:
         return cls._instance
 
     def __init__(self):
+        # контур перемещают moveEvent/resizeEvent окон, опрашивать позиции по таймеру не нужно
         self.windows = []
-        self.position_timer = QTimer()
-        self.position_timer.timeout.connect(self.check_window_positions)
-        self.position_timer.start(100)
 
     def add_window(self, window):
         self.windows.append(window)
@@ -195,13 +205,8 @@ class WindowManager:
                 else:
                     window.outline_widget.hide()
 
-    def check_window_positions(self):
-        for window in self.windows:
-            if hasattr(window, 'outline_widget') and window.isActiveWindow():
-                window.outline_widget.update_position()
 
-
-class WindowAbs(WindowsFramelessWindow):
+class WindowAbs(FramelessWindow):
     def __init__(self):
         super().__init__()
         # self.setMinimumWidth(750)
@@ -241,9 +246,8 @@ class DialogAbs(QDialog):
         self.centralLayout = QHBoxLayout(self.centralContainer)
         self.centralLayout.setContentsMargins(0, 0, 0, 0)
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.checkMousePos)
-        self.timer.start(10)
+        # курсор у краёв меняется по событиям наведения: HoverMove приходит окну и над дочерними виджетами
+        self.setAttribute(Qt.WidgetAttribute.WA_Hover)
 
     def setCentralWidget(self, widget):
         for i in reversed(range(self.centralLayout.count())):
@@ -277,6 +281,13 @@ class DialogAbs(QDialog):
         painter.setPen(Qt.PenStyle.NoPen)
         painter.drawPath(path)
 
+    def event(self, event):
+        if event.type() == QEvent.Type.HoverMove:
+            self.checkMousePos()
+        elif event.type() == QEvent.Type.HoverLeave:
+            self.unsetCursor()
+        return super().event(event)
+
     def checkMousePos(self):
         if self.maximumSize() == self.minimumSize():
             return
@@ -317,6 +328,9 @@ class DialogAbs(QDialog):
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton:
             self.pointMode = self.getDirectionMousePos()
+            # изменение размера отдаём оконной системе, вручную - только если она не умеет
+            if self.pointMode and self.windowHandle().startSystemResize(RESIZE_EDGES[self.pointMode]):
+                self.pointMode = None
         super().mousePressEvent(event)
 
     def mouseReleaseEvent(self, event):